@@ -0,0 +1,264 @@
+"""Replay weighted request mixes against the ASGI app and record latencies.
+
+Needs only the local Postgres and Redis from .env: the app runs in-process
+through httpx's ASGITransport, with its lifespan started by hand. Seeded rows
+are committed and left in place.
+
+    python -m benchmarks.load_test [--mix read] [--requests 5000] [--concurrency 32]
+        [--users 50] [--books-per-user 20] [--reviews-per-book 5]
+        [--output load_test-<commit>.json]
+
+Compare two runs by diffing their JSON reports (p50/p95/p99 in ms, RPS and
+mean queries per request, per endpoint).
+"""
+
+import os
+
+# Keep the access log from flooding the terminal; 5xx are still logged.
+os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import httpx
+
+from scripts.seed import seed
+from src.app import app, life_span
+from src.auth.utils import create_access_token
+from src.db.main import Session
+
+SEARCH_TERMS = ["book", "seed", "author", "benchmark"]
+
+
+def list_books(data, rng):
+    return "GET", "/api/v1/books/?limit=20", None
+
+
+def user_books(data, rng):
+    user = rng.choice(data["users"])
+    return "GET", f"/api/v1/books/user/{user['uid']}?limit=20", None
+
+
+def book_detail(data, rng):
+    return "GET", f"/api/v1/books/{rng.choice(data['books'])}", None
+
+
+def book_reviews(data, rng):
+    book_uid = rng.choice(data["books"])
+    sort = rng.choice(["recent", "rating"])
+    return "GET", f"/api/v1/books/{book_uid}/reviews?sort={sort}", None
+
+
+def search_books(data, rng):
+    return "GET", f"/api/v1/books/search?q={rng.choice(SEARCH_TERMS)}", None
+
+
+def me(data, rng):
+    return "GET", "/api/v1/auth/me", None
+
+
+def create_book(data, rng):
+    body = {
+        "title": f"Load test book {rng.randint(0, 10**9)}",
+        "description": "Created by benchmarks.load_test.",
+        "author": f"Author {rng.randint(0, 500)}",
+    }
+    return "POST", "/api/v1/books/", body
+
+
+def create_review(data, rng):
+    body = {"rating": rng.randint(1, 4)}
+    return "POST", f"/api/v1/reviews/book/{rng.choice(data['books'])}", body
+
+
+# mix name -> [(weight, endpoint)]
+MIXES = {
+    "read": [
+        (40, list_books),
+        (20, book_detail),
+        (15, book_reviews),
+        (10, user_books),
+        (10, search_books),
+        (5, me),
+    ],
+    "mixed": [
+        (30, list_books),
+        (20, book_detail),
+        (10, book_reviews),
+        (10, search_books),
+        (10, me),
+        (10, create_review),
+        (10, create_book),
+    ],
+    "write": [
+        (50, create_review),
+        (30, create_book),
+        (20, book_detail),
+    ],
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+
+    rank = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+def summarize(samples: list[dict], duration: float) -> dict:
+    latencies = sorted(sample["ms"] for sample in samples)
+    queries = [
+        sample["queries"] for sample in samples if sample["queries"] is not None
+    ]
+
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / duration, 2),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "queries_mean": round(sum(queries) / len(queries), 2) if queries else None,
+        "queries_max": max(queries) if queries else None,
+        "statuses": dict(Counter(str(sample["status"]) for sample in samples)),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_plan(data: dict, mix: str, count: int, rng: random.Random) -> list[tuple]:
+    weights, endpoints = zip(*MIXES[mix])
+    plan = []
+
+    for endpoint in rng.choices(endpoints, weights=weights, k=count):
+        user = rng.choice(data["users"])
+        plan.append((endpoint.__name__, user["token"], *endpoint(data, rng)))
+
+    return plan
+
+
+async def replay(client: httpx.AsyncClient, plan: list[tuple], concurrency: int):
+    samples = defaultdict(list)
+    queue = iter(plan)
+
+    async def worker():
+        for name, token, method, path, body in queue:
+            start = time.perf_counter()
+            response = await client.request(
+                method, path, json=body, headers={"Authorization": f"Bearer {token}"}
+            )
+            elapsed = time.perf_counter() - start
+            query_count = response.headers.get("X-DB-Query-Count")
+            samples[name].append(
+                {
+                    "ms": elapsed * 1000,
+                    "status": response.status_code,
+                    "queries": int(query_count) if query_count is not None else None,
+                }
+            )
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--books-per-user", type=int, default=20)
+    parser.add_argument("--reviews-per-book", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output = args.output or f"load_test-{commit or 'unknown'}.json"
+    rng = random.Random(args.seed)
+
+    async with life_span(app):
+        async with Session() as session:
+            data = await seed(
+                session, args.users, args.books_per_user, args.reviews_per_book
+            )
+            await session.commit()
+
+        for user in data["users"]:
+            user["token"] = create_access_token(
+                user_data={
+                    "email": user["email"],
+                    "user_uid": user["uid"],
+                    "role": user["role"],
+                }
+            )
+
+        transport = httpx.ASGITransport(app=app)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest"
+        ) as client:
+            await replay(
+                client, build_plan(data, args.mix, args.warmup, rng), args.concurrency
+            )
+
+            plan = build_plan(data, args.mix, args.requests, rng)
+            start = time.perf_counter()
+            samples = await replay(client, plan, args.concurrency)
+            duration = time.perf_counter() - start
+
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(),
+        "args": vars(args),
+        "duration_seconds": round(duration, 3),
+        "total": summarize(
+            [sample for endpoint in samples.values() for sample in endpoint], duration
+        ),
+        "endpoints": {
+            name: summarize(endpoint, duration)
+            for name, endpoint in sorted(samples.items())
+        },
+    }
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        f"{'endpoint':<14} {'reqs':>6} {'rps':>8} {'p50':>8} {'p95':>8} "
+        f"{'p99':>8} {'queries':>8}"
+    )
+
+    for name, stats in [*report["endpoints"].items(), ("total", report["total"])]:
+        print(
+            f"{name:<14} {stats['requests']:>6} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+            f"{stats['queries_mean'] if stats['queries_mean'] is not None else '-':>8}"
+        )
+
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
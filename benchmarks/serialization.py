@@ -0,0 +1,90 @@
+"""Per-item cost of the book list serialization paths.
+
+Compares FastAPI's default path (validate into pydantic models, dump to
+JSON-compatible python, json.dumps) with the row -> orjson path used by the
+list endpoints.
+
+    python -m benchmarks.serialization [--sizes 1000 10000 100000] [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from src.books.schemas import BookPage
+from src.serializers import dump_json
+
+page_adapter = TypeAdapter(BookPage)
+
+
+def make_rows(count: int) -> list[dict]:
+    now = datetime.now()
+
+    return [
+        {
+            "uid": uuid4(),
+            "title": f"Book {i}",
+            "description": "A book about benchmarking serialization paths.",
+            "author": f"Author {i % 100}",
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now - timedelta(seconds=i),
+            "review_count": 3,
+            "rating_sum": 9,
+            "rating_histogram": [0, 1, 1, 1],
+            "rating_average": 3.0,
+        }
+        for i in range(count)
+    ]
+
+
+def pydantic_path(rows: list[dict]) -> bytes:
+    page = page_adapter.validate_python({"items": rows, "next_cursor": None})
+    content = page_adapter.dump_python(page, mode="json")
+
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def orjson_path(rows: list[dict]) -> bytes:
+    return dump_json({"items": rows, "next_cursor": None})
+
+
+def best_of(fn, rows: list[dict], repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'items':>8} {'pydantic us/item':>18} {'orjson us/item':>16} {'speedup':>8}"
+    )
+
+    for size in args.sizes:
+        rows = make_rows(size)
+        slow = best_of(pydantic_path, rows, args.repeat)
+        fast = best_of(orjson_path, rows, args.repeat)
+
+        print(
+            f"{size:>8} {slow / size * 1e6:>18.2f} {fast / size * 1e6:>16.2f} "
+            f"{slow / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Add indexes for the service query patterns.
+
+Revision ID: a3f1c9d2e7b4
+Revises: db1b40a44e96
+Create Date: 2026-10-17 10:12:05.418233
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f1c9d2e7b4"
+down_revision: Union[str, None] = "db1b40a44e96"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    # get_user_by_email / get_principal_by_email on every authenticated request
+    ("ix_users_email", "users", ["email"], True),
+    # get_all_books keyset pagination on (created_at, uid)
+    ("ix_books_created_at_uid", "books", ["created_at", "uid"], False),
+    # get_user_books: filter on user_uid, keyset on (created_at, uid)
+    (
+        "ix_books_user_uid_created_at_uid",
+        "books",
+        ["user_uid", "created_at", "uid"],
+        False,
+    ),
+    # Book.reviews loads filter on book_uid
+    ("ix_reviews_book_uid_created_at", "reviews", ["book_uid", "created_at"], False),
+    # User.reviews loads filter on user_uid
+    ("ix_reviews_user_uid", "reviews", ["user_uid"], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,57 @@
+"""Add uid to the reviews created_at index for keyset pagination.
+
+Revision ID: a8c5f2d9e3b7
+Revises: d3a7c1e9f2b5
+Create Date: 2026-10-17 18:05:47.532816
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8c5f2d9e3b7"
+down_revision: Union[str, None] = "d3a7c1e9f2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reviews_book_uid_created_at_uid",
+            "reviews",
+            ["book_uid", "created_at", "uid"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_reviews_book_uid_created_at",
+            table_name="reviews",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reviews_book_uid_created_at",
+            "reviews",
+            ["book_uid", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_reviews_book_uid_created_at_uid",
+            table_name="reviews",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,39 @@
+"""Add outbox table.
+
+Revision ID: b9d4e2f7a1c6
+Revises: f1b6e3a8c5d7
+Create Date: 2026-10-17 14:08:21.415927
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b9d4e2f7a1c6"
+down_revision: Union[str, None] = "f1b6e3a8c5d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "outbox",
+        sa.Column("uid", sa.UUID(), nullable=False),
+        sa.Column("topic", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint("uid"),
+    )
+    op.create_index("ix_outbox_created_at", "outbox", ["created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_outbox_created_at", table_name="outbox")
+    op.drop_table("outbox")
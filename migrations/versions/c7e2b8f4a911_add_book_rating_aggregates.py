@@ -0,0 +1,49 @@
+"""Add rating aggregates to books.
+
+Revision ID: c7e2b8f4a911
+Revises: a3f1c9d2e7b4
+Create Date: 2026-10-17 11:02:47.903114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2b8f4a911"
+down_revision: Union[str, None] = "a3f1c9d2e7b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows get zeros; run scripts.backfill_rating_aggregates afterwards.
+    op.add_column(
+        "books",
+        sa.Column("review_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "books",
+        sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "books",
+        sa.Column(
+            "rating_histogram",
+            postgresql.ARRAY(sa.Integer()),
+            server_default="{0,0,0,0}",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("books", "rating_histogram")
+    op.drop_column("books", "rating_sum")
+    op.drop_column("books", "review_count")
@@ -0,0 +1,46 @@
+"""Keep outbox rows the relay cannot publish.
+
+Revision ID: d3a7c1e9f2b5
+Revises: b9d4e2f7a1c6
+Create Date: 2026-10-17 16:42:09.118304
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a7c1e9f2b5"
+down_revision: Union[str, None] = "b9d4e2f7a1c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "outbox", sa.Column("failed_at", postgresql.TIMESTAMP(), nullable=True)
+    )
+    op.add_column(
+        "outbox",
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.drop_index("ix_outbox_created_at", table_name="outbox")
+    op.create_index(
+        "ix_outbox_pending_created_at",
+        "outbox",
+        ["created_at"],
+        postgresql_where=sa.text("failed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_outbox_pending_created_at", table_name="outbox")
+    op.create_index("ix_outbox_created_at", "outbox", ["created_at"])
+    op.drop_column("outbox", "error")
+    op.drop_column("outbox", "failed_at")
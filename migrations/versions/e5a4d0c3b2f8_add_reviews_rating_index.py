@@ -0,0 +1,44 @@
+"""Add reviews index for rating-sorted pagination.
+
+Revision ID: e5a4d0c3b2f8
+Revises: c7e2b8f4a911
+Create Date: 2026-10-17 11:40:19.226457
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a4d0c3b2f8"
+down_revision: Union[str, None] = "c7e2b8f4a911"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reviews_book_uid_rating",
+            "reviews",
+            ["book_uid", "rating", "created_at", "uid"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_reviews_book_uid_rating",
+            table_name="reviews",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,65 @@
+"""Add full-text search vector to books.
+
+Revision ID: f1b6e3a8c5d7
+Revises: e5a4d0c3b2f8
+Create Date: 2026-10-17 12:15:33.870512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# Frozen copy of src.db.models.BOOK_SEARCH_DOCUMENT as of this revision.
+BOOK_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(author, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b6e3a8c5d7"
+down_revision: Union[str, None] = "e5a4d0c3b2f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the books table.
+    op.add_column(
+        "books",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(BOOK_SEARCH_DOCUMENT, persisted=True),
+            nullable=True,
+        ),
+    )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_books_search_vector",
+            "books",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_books_search_vector",
+            table_name="books",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.drop_column("books", "search_vector")
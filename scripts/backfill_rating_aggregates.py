@@ -0,0 +1,50 @@
+"""Backfill or repair Book.review_count, rating_sum and rating_histogram.
+
+Walks the books table in uid order and recomputes the aggregates from the
+reviews table one batch at a time, committing after each batch.
+
+    python -m scripts.backfill_rating_aggregates [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+
+from sqlmodel import select
+
+from src.db.main import Session
+from src.db.models import Book
+from src.reviews.service import ReviewService
+
+review_service = ReviewService()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    last_uid = None
+    total = 0
+
+    async with Session() as session:
+        while True:
+            statement = select(Book.uid).order_by(Book.uid).limit(args.batch_size)
+
+            if last_uid is not None:
+                statement = statement.where(Book.uid > last_uid)
+
+            result = await session.exec(statement)
+            book_uids = result.all()
+
+            if not book_uids:
+                break
+
+            await review_service.recompute_rating_aggregates(book_uids, session)
+
+            last_uid = book_uids[-1]
+            total += len(book_uids)
+            print(f"Recomputed {total} books")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
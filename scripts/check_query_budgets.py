@@ -0,0 +1,133 @@
+"""Fail if an endpoint issues more queries than its budget.
+
+Seeds a small dataset, calls the read endpoints through the ASGI app and
+checks each response's X-DB-Query-Count against the budget below, so an N+1
+introduced by a relationship or a serializer fails the run. Seeded rows are
+deleted at the end.
+
+    python -m scripts.check_query_budgets
+"""
+
+import os
+
+os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+
+import asyncio
+import sys
+from uuid import UUID
+
+import httpx
+from sqlalchemy import delete, or_
+
+from scripts.seed import seed
+from src.app import app, life_span
+from src.auth.service import UserService
+from src.auth.utils import create_access_token
+from src.db.main import Session
+from src.db.models import Book, Review, User
+from src.db.query_stats import assert_query_budget, query_budget
+
+user_service = UserService()
+
+# name -> (path builder, max queries). Endpoints behind RoleChecker spend one
+# query on the caller's principal; the book detail is requested once, so it
+# is a cache miss.
+BUDGETS = {
+    "list_books": (lambda data: "/api/v1/books/?limit=20", 2),
+    "user_books": (
+        lambda data: f"/api/v1/books/user/{data['users'][0]['uid']}?limit=20",
+        1,
+    ),
+    "search_books": (lambda data: "/api/v1/books/search?q=seed", 1),
+    "book_detail": (lambda data: f"/api/v1/books/{data['books'][0]}", 2),
+    "book_reviews": (
+        lambda data: f"/api/v1/books/{data['books'][0]}/reviews?sort=rating",
+        1,
+    ),
+    "me": (lambda data: "/api/v1/auth/me", 4),
+}
+
+
+async def check_endpoints(data: dict) -> int:
+    user = data["users"][0]
+    token = create_access_token(
+        user_data={
+            "email": user["email"],
+            "user_uid": user["uid"],
+            "role": user["role"],
+        }
+    )
+    failures = 0
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://querybudget",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        for name, (path, budget) in BUDGETS.items():
+            response = await client.get(path(data))
+
+            try:
+                if response.status_code != 200:
+                    raise AssertionError(f"status {response.status_code}")
+
+                assert_query_budget(response, budget)
+                print(f"ok   {name}: {response.headers['X-DB-Query-Count']}/{budget}")
+
+            except AssertionError as e:
+                failures += 1
+                print(f"FAIL {name}: {e}")
+
+    return failures
+
+
+async def check_services(data: dict) -> int:
+    # selectin loading must stay one query per relationship, however many rows.
+    try:
+        async with Session() as session:
+            with query_budget(3):
+                await user_service.get_user_by_email(
+                    data["users"][0]["email"], session, load_relations=True
+                )
+
+        print("ok   get_user_by_email(load_relations=True)")
+        return 0
+
+    except AssertionError as e:
+        print(f"FAIL get_user_by_email(load_relations=True): {e}")
+        return 1
+
+
+async def delete_seed(data: dict) -> None:
+    user_uids = [UUID(user["uid"]) for user in data["users"]]
+    book_uids = [UUID(uid) for uid in data["books"]]
+
+    async with Session() as session:
+        await session.exec(
+            delete(Review).where(
+                or_(Review.book_uid.in_(book_uids), Review.user_uid.in_(user_uids))
+            )
+        )
+        await session.exec(delete(Book).where(Book.uid.in_(book_uids)))
+        await session.exec(delete(User).where(User.uid.in_(user_uids)))
+        await session.commit()
+
+
+async def main() -> int:
+    async with life_span(app):
+        async with Session() as session:
+            data = await seed(session, users=5, books_per_user=30, reviews_per_book=5)
+            await session.commit()
+
+        try:
+            failures = await check_endpoints(data) + await check_services(data)
+
+        finally:
+            await delete_seed(data)
+
+    print(f"Checked {len(BUDGETS) + 1} query budgets, {failures} over budget.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
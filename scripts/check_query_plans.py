@@ -0,0 +1,110 @@
+"""Fail if a service read query plans to a sequential scan.
+
+Seeds a dataset inside a transaction, runs the read paths of the services while
+capturing the SQL they emit, then EXPLAINs every captured statement with
+enable_seqscan=off. A Seq Scan that survives that setting means no index can
+serve the query. The transaction is rolled back at the end.
+
+    python -m scripts.check_query_plans
+"""
+
+import asyncio
+import json
+import sys
+
+from sqlalchemy import event, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth.service import UserService
+from src.books.service import BookService
+from src.db.main import engine
+from src.reviews.service import ReviewService
+from scripts.seed import seed
+
+user_service = UserService()
+book_service = BookService()
+review_service = ReviewService()
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    found = []
+
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+
+    return found
+
+
+async def run_service_queries(session: AsyncSession, data: dict) -> None:
+    user = data["users"][0]
+
+    await user_service.get_principal_by_email(user["email"], session)
+    await user_service.get_user_by_email(user["email"], session, load_relations=True)
+
+    _, cursor = await book_service.get_all_books(session, limit=20)
+    await book_service.get_all_books(session, limit=20, cursor=cursor)
+
+    _, cursor = await book_service.get_user_books(user["uid"], session, limit=20)
+    await book_service.get_user_books(user["uid"], session, limit=20, cursor=cursor)
+
+    await book_service.get_book(data["books"][0], session)
+
+    _, cursor = await book_service.search("book seed", session, limit=5)
+    await book_service.search("book seed", session, limit=5, cursor=cursor)
+
+    for sort in ("recent", "rating"):
+        _, cursor = await review_service.get_book_reviews(
+            data["books"][0], session, limit=2, sort=sort
+        )
+        await review_service.get_book_reviews(
+            data["books"][0], session, limit=2, cursor=cursor, sort=sort
+        )
+
+
+async def main() -> int:
+    captured: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False)
+
+        data = await seed(session, users=50, books_per_user=40, reviews_per_book=3)
+        await conn.execute(text("ANALYZE users, books, reviews"))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await run_service_queries(session, data)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+        failures = 0
+        for statement, parameters in captured:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+
+            seq_scans = find_seq_scans(plan[0]["Plan"])
+            if seq_scans:
+                failures += 1
+                print(f"SEQ SCAN on {', '.join(seq_scans)}:")
+                print(f"  {' '.join(statement.split())}")
+
+        await trans.rollback()
+
+    print(f"Checked {len(captured)} statements, {failures} with sequential scans.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
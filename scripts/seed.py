@@ -0,0 +1,127 @@
+"""Seed users, books and reviews for local benchmarking and plan checks.
+
+    python -m scripts.seed [--users 100] [--books-per-user 50] [--reviews-per-book 5]
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth.utils import generate_pass_hash
+from src.db.main import Session
+from src.db.models import RATING_BUCKETS, Book, Review, User
+
+SEED_PASSWORD = "password1234"
+INSERT_BATCH = 5000
+
+
+async def _insert(session: AsyncSession, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH):
+        await session.exec(insert(model), params=rows[start : start + INSERT_BATCH])
+
+
+async def seed(
+    session: AsyncSession,
+    users: int,
+    books_per_user: int,
+    reviews_per_book: int,
+) -> dict:
+    """Insert a synthetic dataset without committing.
+
+    Returns the seeded users (uid, email, role) and book uids so callers can
+    build requests against them. All seeded users share SEED_PASSWORD.
+    """
+    password_hash = generate_pass_hash(SEED_PASSWORD)
+    now = datetime.now()
+    rng = random.Random(42)
+
+    user_rows = [
+        {
+            "uid": uuid4(),
+            "username": f"seed{i}",
+            "email": f"seed{i}-{uuid4().hex[:8]}@example.com",
+            "first_name": "Seed",
+            "last_name": f"User{i}",
+            "role": "user",
+            "is_verified": True,
+            "password_hash": password_hash,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(users)
+    ]
+
+    book_rows = []
+    for user in user_rows:
+        for i in range(books_per_user):
+            created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+            book_rows.append(
+                {
+                    "uid": uuid4(),
+                    "title": f"Book {i} by {user['username']}",
+                    "description": "Seeded book used for benchmarks.",
+                    "author": f"Author {rng.randint(0, 500)}",
+                    "user_uid": user["uid"],
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+
+    review_rows = []
+    for book in book_rows:
+        histogram = [0] * RATING_BUCKETS
+
+        for _ in range(reviews_per_book):
+            rating = rng.randint(1, RATING_BUCKETS)
+            histogram[rating - 1] += 1
+            review_rows.append(
+                {
+                    "uid": uuid4(),
+                    "rating": rating,
+                    "user_uid": rng.choice(user_rows)["uid"],
+                    "book_uid": book["uid"],
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+        book["review_count"] = reviews_per_book
+        book["rating_sum"] = sum(r * n for r, n in enumerate(histogram, start=1))
+        book["rating_histogram"] = histogram
+
+    await _insert(session, User, user_rows)
+    await _insert(session, Book, book_rows)
+    await _insert(session, Review, review_rows)
+
+    return {
+        "users": [
+            {"uid": str(u["uid"]), "email": u["email"], "role": u["role"]}
+            for u in user_rows
+        ],
+        "books": [str(b["uid"]) for b in book_rows],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--books-per-user", type=int, default=50)
+    parser.add_argument("--reviews-per-book", type=int, default=5)
+    args = parser.parse_args()
+
+    async with Session() as session:
+        data = await seed(
+            session, args.users, args.books_per_user, args.reviews_per_book
+        )
+        await session.commit()
+
+    print(f"Seeded {len(data['users'])} users and {len(data['books'])} books.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+import asyncio
+import contextlib
+import random
+import sys
+import threading
+
+import orjson
+
+from src.config import Config
+
+
+class AccessLog:
+    """Structured (JSON lines) access log written in batches off the event loop.
+
+    Requests only push a dict onto a bounded in-memory queue; a background task
+    drains it and hands each batch to a thread for the blocking write. Entries
+    that don't fit in the queue are dropped and counted rather than slowing
+    requests down. Server errors are always logged, other responses are sampled
+    at `sample_rate`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        stream=None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stream = stream if stream is not None else sys.stdout.buffer
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task | None = None
+        # Serializes writes so a batch is never interleaved with another.
+        self._write_lock = threading.Lock()
+
+    def record(self, entry: dict) -> None:
+        if entry["status"] < 500 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+
+        try:
+            self._queue.put_nowait(entry)
+
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _drain(self, first: dict | None = None) -> list[dict]:
+        batch = [first] if first is not None else []
+
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        return batch
+
+    def _write(self, batch: list[dict]) -> None:
+        data = b"".join(orjson.dumps(entry) + b"\n" for entry in batch)
+
+        with self._write_lock:
+            self.stream.write(data)
+            self.stream.flush()
+            self.written += len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            batch = self._drain(await self._queue.get())
+            await asyncio.to_thread(self._write, batch)
+
+            if len(batch) < self.batch_size:
+                # Let a few more entries pile up instead of writing one by one.
+                await asyncio.sleep(self.flush_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            # Cancelling only abandons the await of an in-flight to_thread
+            # write; the thread still finishes that batch, and _write_lock
+            # makes the final drain below wait for it.
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+        while not self._queue.empty():
+            await asyncio.to_thread(self._write, self._drain())
+
+    def metrics(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+        }
+
+
+access_log = AccessLog(
+    sample_rate=Config.ACCESS_LOG_SAMPLE_RATE,
+    queue_size=Config.ACCESS_LOG_QUEUE_SIZE,
+    batch_size=Config.ACCESS_LOG_BATCH_SIZE,
+    flush_interval=Config.ACCESS_LOG_FLUSH_INTERVAL,
+)
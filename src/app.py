@@ -1,18 +1,30 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, status
+from fastapi.responses import ORJSONResponse
 
+from src.access_log import access_log
+from src.auth.hashing import password_hasher
 from src.auth.routes import auth_router
 from src.books.routes import book_router
-from src.db.main import init_db
+from src.config import Config
+from src.db.main import close_db, init_db
+from src.db.redis_client import blocklist_mirror
+from src.db.replicas import replica_set
+from src.metrics import metrics
+from src.monitoring import monitoring_router
+from src.outbox import outbox_relay
 from src.reviews.routes import review_router
 
 from .errors import (
     AccessTokenRequired,
     BookNotFound,
     InsufficientPermission,
+    InvalidBulkPayload,
     InvalidCredentials,
+    InvalidCursor,
     InvalidToken,
+    PasswordHashingBusy,
     RefreshTokenRequired,
     UserAlreadyExists,
     UserNotFound,
@@ -25,8 +37,26 @@ from .middleware import register_middleware
 async def life_span(app: FastAPI):
     print(f"Server is start...")
     await init_db()
+    access_log.start()
+    metrics.start()
+
+    if Config.TOKEN_BLOCKLIST_MIRROR:
+        blocklist_mirror.start()
+
+    replica_set.start()
+
+    if Config.OUTBOX_RELAY_IN_APP:
+        outbox_relay.start()
+
     yield
 
+    await outbox_relay.stop()
+    await replica_set.stop()
+    await blocklist_mirror.stop()
+    password_hasher.shutdown()
+    await close_db()
+    await access_log.stop()
+    await metrics.stop()
     print(f"Server is stopped")
 
 
@@ -37,6 +67,7 @@ app = FastAPI(
     description="hello",
     version=version,
     lifespan=life_span,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -50,7 +81,48 @@ app.add_exception_handler(
     ),
 )
 
+app.add_exception_handler(
+    InvalidBulkPayload,
+    create_exception_handler(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        initial_detail={"message": "Expected a JSON array or NDJSON body."},
+    ),
+)
+
+app.add_exception_handler(
+    PasswordHashingBusy,
+    create_exception_handler(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        initial_detail={"message": "Server is busy, try again later."},
+    ),
+)
+
+app.add_exception_handler(
+    InvalidCursor,
+    create_exception_handler(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        initial_detail={"message": "Invalid pagination cursor."},
+    ),
+)
+
+app.add_exception_handler(
+    BookNotFound,
+    create_exception_handler(
+        status_code=status.HTTP_404_NOT_FOUND,
+        initial_detail={"message": "Book not found."},
+    ),
+)
+
+app.add_exception_handler(
+    UserNotFound,
+    create_exception_handler(
+        status_code=status.HTTP_404_NOT_FOUND,
+        initial_detail={"message": "User not found."},
+    ),
+)
+
 
 app.include_router(book_router, prefix=f"/api/{version}/books")
 app.include_router(auth_router, prefix=f"/api/{version}/auth")
 app.include_router(review_router, prefix=f"/api/{version}/reviews")
+app.include_router(monitoring_router)
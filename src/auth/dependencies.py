@@ -3,18 +3,20 @@ from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.main import get_session
-from src.db.models import User
 from src.db.redis_client import token_in_blocklist
+from src.db.replicas import get_read_session_maker
 from src.errors import (
     AccessTokenRequired,
     AccountNotVerified,
     InsufficientPermission,
     InvalidToken,
     RefreshTokenRequired,
+    UserNotFound,
 )
 
+from .schemas import UserPrincipal
 from .service import UserService
+from .token_cache import token_cache
 from .utils import decode_token
 
 user_service = UserService()
@@ -28,22 +30,24 @@ class TokenBearer(HTTPBearer):
         creds = await super().__call__(request)
 
         token = creds.credentials
-        token_data = decode_token(token)
+        token_data = token_cache.get(token)
 
-        if not self.token_valid(token):
-            raise InvalidToken()
+        if token_data is None:
+            token_data = decode_token(token)
+
+            if token_data is None:
+                raise InvalidToken()
+
+            token_cache.put(token, token_data)
 
         if await token_in_blocklist(token_data["jti"]):
+            token_cache.discard(token)
             raise InvalidToken()
 
         self.verify_token_data(token_data)
 
         return token_data
 
-    def token_valid(self, token: str) -> bool:
-        token_data = decode_token(token)
-        return token_data is not None
-
     def verify_token_data(self, token_data: dict):
         raise NotImplementedError("Override this method in chold method")
 
@@ -60,13 +64,33 @@ class RefreshTokenBearer(TokenBearer):
             raise RefreshTokenRequired
 
 
+access_token_bearer = AccessTokenBearer()
+
+
+async def get_read_session(
+    token_details: dict = Depends(access_token_bearer),
+) -> AsyncSession:
+    """Session for read-only endpoints, routed to a replica when one is usable.
+
+    Callers who wrote recently stay on the primary so they read their own writes.
+    """
+    Session = await get_read_session_maker(token_details["user"].get("user_uid"))
+
+    async with Session() as session:
+        yield session
+
+
 async def get_current_user(
-    token_details: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
-):
+    token_details: dict = Depends(access_token_bearer),
+    session: AsyncSession = Depends(get_read_session),
+) -> UserPrincipal:
     user_email = token_details["user"]["email"]
 
-    user = await user_service.get_user_by_email(user_email, session)
+    user = await user_service.get_principal_by_email(user_email, session)
+
+    if user is None:
+        raise UserNotFound()
+
     return user
 
 
@@ -74,7 +98,7 @@ class RoleChecker:
     def __init__(self, allowed_roles: list[str]) -> None:
         self.allowed_roles = allowed_roles
 
-    def __call__(self, current_user: User = Depends(get_current_user)):
+    def __call__(self, current_user: UserPrincipal = Depends(get_current_user)):
         if not current_user.is_verified:
             raise AccountNotVerified()
 
@@ -0,0 +1,148 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import Request, status
+from fastapi.exceptions import HTTPException
+from redis.exceptions import RedisError
+
+from src.db.redis_client import token_blocklist as redis
+
+RATE_LIMIT_PREFIX = "ratelimit:"
+LOCAL_BUCKETS_SIZE = 10000
+REDIS_RETRY_INTERVAL = 5
+
+logger = logging.getLogger(__name__)
+
+# Refill and take in one atomic step. Uses the Redis clock so that every
+# worker agrees on the elapsed time. Returns the seconds to wait (0 = allowed)
+# as a string, since Lua numbers are truncated to integers on the way out.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+token_bucket = redis.register_script(TOKEN_BUCKET_LUA)
+
+
+def parse_limit(limit: str) -> tuple[int, float]:
+    """Parse "<requests>/<seconds>", e.g. "5/60" for five requests a minute."""
+    requests, seconds = limit.split("/")
+    return int(requests), float(seconds)
+
+
+class LocalBuckets:
+    """In-process token buckets used while Redis can't be reached.
+
+    Each worker enforces the limit on its own, so the effective limit is
+    multiplied by the number of workers until Redis is back.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        tokens, ts = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+
+        if len(self._buckets) > self.max_size:
+            self._buckets.popitem(last=False)
+
+        return retry_after
+
+
+local_buckets = LocalBuckets(max_size=LOCAL_BUCKETS_SIZE)
+_redis_down_until = 0.0
+
+
+async def take_token(key: str, capacity: int, period: float) -> float:
+    """Take one token from the bucket at `key`, return the seconds to wait."""
+    global _redis_down_until
+
+    rate = capacity / period
+
+    if time.monotonic() >= _redis_down_until:
+        try:
+            return float(await token_bucket(keys=[key], args=[capacity, rate]))
+
+        except (RedisError, OSError) as e:
+            logger.warning("Rate limiting falls back to local buckets: %s", e)
+            _redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    return local_buckets.take(key, capacity, rate)
+
+
+class RateLimiter:
+    """Dependency limiting a route per client IP and per submitted email.
+
+    The email is read from the JSON body; FastAPI caches the parsed body on the
+    request, so the route's own body model doesn't parse it again.
+    """
+
+    def __init__(self, scope: str, ip_limit: str, email_limit: str) -> None:
+        self.scope = scope
+        self.ip_limit = parse_limit(ip_limit)
+        self.email_limit = parse_limit(email_limit)
+
+    async def _email(self, request: Request) -> str | None:
+        try:
+            body = await request.json()
+
+        except ValueError:
+            return None
+
+        email = body.get("email") if isinstance(body, dict) else None
+        return email.strip().lower() if isinstance(email, str) else None
+
+    async def __call__(self, request: Request) -> None:
+        buckets = []
+
+        if request.client is not None:
+            buckets.append((f"ip:{request.client.host}", self.ip_limit))
+
+        email = await self._email(request)
+
+        if email:
+            buckets.append((f"email:{email}", self.email_limit))
+
+        for key, (capacity, period) in buckets:
+            retry_after = await take_token(
+                f"{RATE_LIMIT_PREFIX}{self.scope}:{key}", capacity, period
+            )
+
+            if retry_after > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail={"message": "Too many requests. Try again later."},
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
@@ -9,13 +9,22 @@ from src.config import Config
 from src.db.main import get_session
 from src.db.redis_client import add_jti_to_blocklist
 from src.errors import InvalidCredentials, InvalidToken, UserAlreadyExists, UserNotFound
-from src.mail import create_message, mail
+from src.mail_queue import (
+    PRIORITY_BULK,
+    PRIORITY_PASSWORD_RESET,
+    PRIORITY_VERIFICATION,
+    enqueue_mail,
+    enqueue_mail_batch,
+)
+from src.outbox import mail_outbox_message
+from src.serializers import json_response, user_books_to_dict
 
 from .dependencies import (
     AccessTokenBearer,
     RefreshTokenBearer,
     RoleChecker,
     get_current_user,
+    get_read_session,
 )
 from .schemas import (
     EmailModel,
@@ -25,21 +34,27 @@ from .schemas import (
     UserCreateModel,
     UserLoginModel,
 )
+from .hashing import password_hasher
+from .rate_limit import RateLimiter
 from .service import UserService
-from .utils import (
-    create_access_token,
-    create_url_safe_token,
-    decode_url_safe_token,
-    generate_pass_hash,
-    verify_password,
-)
-
-from src.celery_tasks import send_email_celery
+from .utils import create_access_token, create_url_safe_token, decode_url_safe_token
 
 auth_router = APIRouter()
 user_service = UserService()
 role_checker = RoleChecker(["admin", "user"])
 
+login_rate_limiter = RateLimiter(
+    "login", Config.RATE_LIMIT_LOGIN_IP, Config.RATE_LIMIT_LOGIN_EMAIL
+)
+signup_rate_limiter = RateLimiter(
+    "signup", Config.RATE_LIMIT_SIGNUP_IP, Config.RATE_LIMIT_SIGNUP_EMAIL
+)
+password_reset_rate_limiter = RateLimiter(
+    "password-reset",
+    Config.RATE_LIMIT_PASSWORD_RESET_IP,
+    Config.RATE_LIMIT_PASSWORD_RESET_EMAIL,
+)
+
 REFRESH_TOKEN_EXPIRY = 2
 
 
@@ -47,11 +62,11 @@ REFRESH_TOKEN_EXPIRY = 2
 async def send_email(emails: EmailModel):
     emails = emails.adressess
 
-    subject = "Welcome email."
-
-    html = "<h1>ПРИВІТТТТТ</h1>"
-
-    send_email_celery.delay(emails, subject, html)
+    await enqueue_mail_batch(
+        "welcome",
+        [{"recipients": [email], "context": {"email": email}} for email in emails],
+        priority=PRIORITY_BULK,
+    )
 
     return {"message": "Send successfully."}
 
@@ -61,6 +76,7 @@ async def create_user_Account(
     user_data: UserCreateModel,
     bg_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
+    _: None = Depends(signup_rate_limiter),
 ):
     """
     Create user account using email, username, first_name, last_name
@@ -74,22 +90,24 @@ async def create_user_Account(
     if user_exists:
         raise UserAlreadyExists()
 
-    new_user = await user_service.create_user(user_data, session)
-
     token = create_url_safe_token({"email": email})
 
     link = f"http://{Config.DOMAIN}/api/v1/auth/verify/{token}"
 
-    html = f"""
-    <h1>Verify your Email</h1>
-    <p>Please click this <a href="{link}">link</a> to verify your email</p>
-    """
-
-    emails = [email]
-
-    subject = "Verify Your email"
-
-    send_email_celery.delay(emails, subject, html)
+    # Queued through the outbox so the mail survives a broker outage or a crash
+    # right after the commit.
+    new_user = await user_service.create_user(
+        user_data,
+        session,
+        outbox=[
+            mail_outbox_message(
+                "verify_email",
+                [email],
+                {"first_name": user_data.first_name, "link": link},
+                priority=PRIORITY_VERIFICATION,
+            )
+        ],
+    )
 
     return {
         "message": "Account Created! Check email to verify your account",
@@ -102,13 +120,13 @@ async def verify_user_account(token: str, session: AsyncSession = Depends(get_se
 
     user_email = token_data.get("email")
     if user_email:
-        user = await user_service.get_user_by_email(user_email, session)
+        user = await user_service.update_user(
+            user_email, {"is_verified": True}, session
+        )
 
         if not user:
             raise UserNotFound()
 
-        await user_service.update_user(user, {"is_verified": True}, session)
-
         return JSONResponse(
             content={"message": "Account Veryfied."}, status_code=status.HTTP_200_OK
         )
@@ -121,7 +139,9 @@ async def verify_user_account(token: str, session: AsyncSession = Depends(get_se
 
 @auth_router.post("/login")
 async def login_users(
-    login_data: UserLoginModel, session: AsyncSession = Depends(get_session)
+    login_data: UserLoginModel,
+    session: AsyncSession = Depends(get_session),
+    _: None = Depends(login_rate_limiter),
 ) -> dict:
     email = login_data.email
     password = login_data.password
@@ -129,7 +149,7 @@ async def login_users(
     user = await user_service.get_user_by_email(email, session)
 
     if user is not None:
-        password_valid = verify_password(password, user.password_hash)
+        password_valid = await password_hasher.verify(password, user.password_hash)
 
         if password_valid:
             access_token = create_access_token(
@@ -187,30 +207,37 @@ async def revooke_token(token_details: dict = Depends(AccessTokenBearer())):
 
 @auth_router.get("/me", response_model=UserBooksModel)
 async def get_current_user(
-    user=Depends(get_current_user),
+    principal=Depends(get_current_user),
     _: bool = Depends(role_checker),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    return user
+    user = await user_service.get_user_by_email(
+        principal.email, session, load_relations=True
+    )
+    return json_response(user_books_to_dict(user))
 
 
 @auth_router.post("/password-reset")
-async def password_reset(email_data: PasswordResetRequestModel):
+async def password_reset(
+    email_data: PasswordResetRequestModel,
+    _: None = Depends(password_reset_rate_limiter),
+):
     email = email_data.email
 
     token = create_url_safe_token({"email": email})
 
     link = f"http://{Config.DOMAIN}/api/v1/auth/password-reset-confirm/{token}"
 
-    html_message = f"""
-        Reset password, click link: {link}
-    """
-
-    message = create_message(
-        recipients=[email], subject="Reset password.", body=html_message
+    # Same answer whether or not a mail was queued, so repeats can't be probed.
+    await enqueue_mail(
+        "password_reset",
+        [email],
+        {"link": link},
+        priority=PRIORITY_PASSWORD_RESET,
+        dedup_key=f"password-reset:{email.strip().lower()}",
+        dedup_seconds=Config.PASSWORD_RESET_DEDUP_SECONDS,
     )
 
-    await mail.send_message(message)
-
     return JSONResponse(
         content={"message": "Check your email and follow instructions."},
         status_code=status.HTTP_200_OK,
@@ -235,15 +262,15 @@ async def reset_password(
 
     user_email = token_data.get("email")
     if user_email:
-        user = await user_service.get_user_by_email(user_email, session)
+        password_hash = await password_hasher.hash(new_password)
+
+        user = await user_service.update_user(
+            user_email, {"password_hash": password_hash}, session
+        )
 
         if not user:
             raise UserNotFound()
 
-        password_hash = generate_pass_hash(new_password)
-
-        await user_service.update_user(user, {"password_hash": password_hash}, session)
-
         return JSONResponse(
             content={"message": "Password reset successfully."},
             status_code=status.HTTP_200_OK,
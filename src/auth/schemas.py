@@ -31,6 +31,15 @@ class UserModel(BaseModel):
     updated_at: datetime
 
 
+class UserPrincipal(BaseModel):
+    """Minimal view of the authenticated user used for authorization checks."""
+
+    uid: UUID
+    email: str
+    role: str
+    is_verified: bool
+
+
 class UserLoginModel(BaseModel):
     email: str = Field(max_length=255)
     password: str = Field(min_length=8, max_length=64)
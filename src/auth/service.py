@@ -1,42 +1,82 @@
+from sqlalchemy import func, update
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models import User
+from src.db.models import OutboxMessage, User
 
-from .schemas import UserCreateModel
-from .utils import generate_pass_hash
+from .hashing import password_hasher
+from .schemas import UserCreateModel, UserPrincipal
 
 
 class UserService:
 
-    async def get_user_by_email(self, email: str, session: AsyncSession):
+    async def get_user_by_email(
+        self, email: str, session: AsyncSession, load_relations: bool = False
+    ):
         statement = select(User).where(User.email == email)
+
+        if load_relations:
+            statement = statement.options(
+                selectinload(User.books), selectinload(User.reviews)
+            )
+
         result = await session.exec(statement)
         user = result.first()
 
         return user
 
+    async def get_principal_by_email(
+        self, email: str, session: AsyncSession
+    ) -> UserPrincipal | None:
+        statement = select(User.uid, User.email, User.role, User.is_verified).where(
+            User.email == email
+        )
+        result = await session.exec(statement)
+        row = result.first()
+
+        return UserPrincipal(**row._asdict()) if row is not None else None
+
     async def user_exists(self, email, session: AsyncSession):
         user = await self.get_user_by_email(email, session)
 
         return True if user is not None else False
 
-    async def create_user(self, user_data: UserCreateModel, session: AsyncSession):
+    async def create_user(
+        self,
+        user_data: UserCreateModel,
+        session: AsyncSession,
+        outbox: list[OutboxMessage] = (),
+    ):
+        """Insert the user together with `outbox` messages in one transaction."""
         user_data_dict = user_data.model_dump()
 
         new_user = User(**user_data_dict)
-        new_user.password_hash = generate_pass_hash(user_data_dict["password"])
+        new_user.password_hash = await password_hasher.hash(
+            user_data_dict["password"]
+        )
         new_user.role = "user"
 
         session.add(new_user)
+        session.add_all(outbox)
         await session.commit()
 
         return new_user
 
-    async def update_user(self, user: User, user_data: dict, session: AsyncSession):
-        for k, v in user_data.items():
-            setattr(user, k, v)
+    async def update_user(self, email: str, user_data: dict, session: AsyncSession):
+        """Apply `user_data` to the user with this email in one UPDATE ... RETURNING.
 
+        Returns the updated principal, or None if no such user exists.
+        """
+        statement = (
+            update(User)
+            .where(User.email == email)
+            .values(**user_data, updated_at=func.now())
+            .returning(User.uid, User.email, User.role, User.is_verified)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+        row = result.first()
         await session.commit()
 
-        return user
+        return UserPrincipal(**row._asdict()) if row is not None else None
@@ -0,0 +1,61 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from src.config import Config
+
+
+class TokenCache:
+    """Process-local LRU of verified JWT claims, keyed by the token's digest.
+
+    Entries are kept until the token's own `exp`, so a cache hit never extends
+    a token's lifetime.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        claims = self._entries.get(key)
+
+        if claims is None or claims["exp"] <= time.time():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        if self.max_size <= 0 or "exp" not in claims:
+            return
+
+        key = self._key(token)
+        self._entries[key] = claims
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        self._entries.pop(self._key(token), None)
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+token_cache = TokenCache(max_size=Config.TOKEN_CACHE_SIZE)
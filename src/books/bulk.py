@@ -0,0 +1,45 @@
+from typing import AsyncIterator
+
+import orjson
+from fastapi import Request
+
+from src.errors import InvalidBulkPayload
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson")
+
+
+async def iter_bulk_items(request: Request) -> AsyncIterator[bytes | dict]:
+    """Yield raw items from a JSON array or NDJSON request body.
+
+    NDJSON bodies are consumed as they stream in and yield one encoded line at
+    a time; a JSON array has to be parsed whole and yields decoded objects.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith(NDJSON_CONTENT_TYPES):
+        buffer = b""
+
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+
+            for line in lines:
+                if line.strip():
+                    yield line
+
+        if buffer.strip():
+            yield buffer
+
+        return
+
+    try:
+        items = orjson.loads(await request.body())
+
+    except orjson.JSONDecodeError:
+        raise InvalidBulkPayload()
+
+    if not isinstance(items, list):
+        raise InvalidBulkPayload()
+
+    for item in items:
+        yield item
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from redis import asyncio as aioredis
+
+from src.config import Config
+from src.db.redis_client import token_blocklist as redis
+
+BOOK_CACHE_PREFIX = "book:detail:"
+BOOK_LOCK_PREFIX = "book:lock:"
+BOOK_GENERATION_PREFIX = "book:gen:"
+LOCK_TIMEOUT_MS = 5000
+LOCK_POLL_INTERVAL = 0.05
+LOCK_POLL_ATTEMPTS = 10
+
+logger = logging.getLogger(__name__)
+
+# Store a loaded payload only if no invalidation happened since the load began.
+# KEYS: generation, payload. ARGV: generation seen before loading, payload, ttl.
+SET_IF_CURRENT_LUA = """
+if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+# KEYS: generation, payload. ARGV: generation ttl.
+INVALIDATE_LUA = """
+redis.call('DEL', KEYS[2])
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+"""
+
+
+def cache_key(book_uid: str | UUID) -> str:
+    """Canonical form of a book uid, so any spelling of it hits the same entry."""
+    return str(UUID(str(book_uid)))
+
+
+class BookDetailCache:
+    """Two-tier cache of serialized book detail payloads.
+
+    L1 is a small per-process LRU with a short TTL, L2 is Redis. Concurrent
+    misses for the same book are collapsed: within a process callers share one
+    load, and across processes a Redis lock lets a single worker hit Postgres
+    while the others poll L2 for its result.
+
+    Every invalidation bumps a per-book generation in Redis, and a load only
+    stores its result if the generation is unchanged, so a read that raced a
+    write can't put the old row back.
+    """
+
+    def __init__(
+        self, redis: aioredis.Redis, ttl: int, l1_ttl: float, l1_size: int
+    ) -> None:
+        self.ttl = ttl
+        self.l1_ttl = l1_ttl
+        self.l1_size = l1_size
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self._redis = redis
+        self._l1: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._set_if_current = redis.register_script(SET_IF_CURRENT_LUA)
+        self._invalidate = redis.register_script(INVALIDATE_LUA)
+
+    def _l1_get(self, book_uid: str) -> bytes | None:
+        entry = self._l1.get(book_uid)
+
+        if entry is None:
+            return None
+
+        expires_at, payload = entry
+
+        if expires_at <= time.monotonic():
+            del self._l1[book_uid]
+            return None
+
+        self._l1.move_to_end(book_uid)
+        return payload
+
+    def _l1_set(self, book_uid: str, payload: bytes) -> None:
+        self._l1[book_uid] = (time.monotonic() + self.l1_ttl, payload)
+        self._l1.move_to_end(book_uid)
+
+        while len(self._l1) > self.l1_size:
+            self._l1.popitem(last=False)
+
+    async def _l2_get(self, book_uid: str) -> bytes | None:
+        try:
+            return await self._redis.get(f"{BOOK_CACHE_PREFIX}{book_uid}")
+
+        except aioredis.RedisError as e:
+            logger.warning("Book cache read failed: %s", e)
+            return None
+
+    async def _l2_generation(self, book_uid: str) -> bytes:
+        try:
+            generation = await self._redis.get(f"{BOOK_GENERATION_PREFIX}{book_uid}")
+
+        except aioredis.RedisError as e:
+            logger.warning("Book cache read failed: %s", e)
+            return b""
+
+        return generation or b"0"
+
+    async def _l2_set(self, book_uid: str, generation: bytes, payload: bytes) -> None:
+        try:
+            await self._set_if_current(
+                keys=[
+                    f"{BOOK_GENERATION_PREFIX}{book_uid}",
+                    f"{BOOK_CACHE_PREFIX}{book_uid}",
+                ],
+                args=[generation, payload, self.ttl],
+            )
+
+        except aioredis.RedisError as e:
+            logger.warning("Book cache write failed: %s", e)
+
+    async def _load(
+        self, book_uid: str, loader: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        payload = await self._l2_get(book_uid)
+
+        if payload is not None:
+            self.l2_hits += 1
+            return payload
+
+        lock_key = f"{BOOK_LOCK_PREFIX}{book_uid}"
+
+        try:
+            locked = await self._redis.set(lock_key, "", nx=True, px=LOCK_TIMEOUT_MS)
+
+        except aioredis.RedisError:
+            locked = True
+
+        if not locked:
+            # Another worker is loading this book; give it a moment to publish.
+            for _ in range(LOCK_POLL_ATTEMPTS):
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                payload = await self._l2_get(book_uid)
+
+                if payload is not None:
+                    self.l2_hits += 1
+                    return payload
+
+        self.misses += 1
+        # Read before loading: a write committed after this point bumps it.
+        generation = await self._l2_generation(book_uid)
+
+        try:
+            payload = await loader()
+
+            if payload is not None:
+                await self._l2_set(book_uid, generation, payload)
+
+            return payload
+
+        finally:
+            if locked:
+                try:
+                    await self._redis.delete(lock_key)
+
+                except aioredis.RedisError:
+                    pass
+
+    async def get_or_load(
+        self, book_uid: str | UUID, loader: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        book_uid = cache_key(book_uid)
+        payload = self._l1_get(book_uid)
+
+        if payload is not None:
+            self.l1_hits += 1
+            return payload
+
+        inflight = self._inflight.get(book_uid)
+
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[book_uid] = future
+
+        try:
+            payload = await self._load(book_uid, loader)
+
+            # invalidate() detaches the future if a write landed meanwhile.
+            if payload is not None and self._inflight.get(book_uid) is future:
+                self._l1_set(book_uid, payload)
+
+            future.set_result(payload)
+            return payload
+
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody awaited isn't logged.
+            future.exception()
+            raise
+
+        finally:
+            if not future.done():
+                future.cancel()
+
+            if self._inflight.get(book_uid) is future:
+                del self._inflight[book_uid]
+
+    async def invalidate(self, book_uid: str | UUID) -> None:
+        """Drop a book's cached detail after a write.
+
+        Loads already in flight won't store their result, and later callers
+        start a new load instead of joining them. Other workers' L1 copies
+        expire within BOOK_CACHE_L1_TTL seconds.
+        """
+        book_uid = cache_key(book_uid)
+        self._l1.pop(book_uid, None)
+        self._inflight.pop(book_uid, None)
+
+        try:
+            await self._invalidate(
+                keys=[
+                    f"{BOOK_GENERATION_PREFIX}{book_uid}",
+                    f"{BOOK_CACHE_PREFIX}{book_uid}",
+                ],
+                args=[self.ttl],
+            )
+
+        except aioredis.RedisError as e:
+            logger.warning("Book cache invalidation failed: %s", e)
+
+    def metrics(self) -> dict:
+        return {
+            "l1_size": len(self._l1),
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+        }
+
+
+book_detail_cache = BookDetailCache(
+    redis,
+    ttl=Config.BOOK_CACHE_TTL,
+    l1_ttl=Config.BOOK_CACHE_L1_TTL,
+    l1_size=Config.BOOK_CACHE_L1_SIZE,
+)
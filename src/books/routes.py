@@ -1,41 +1,76 @@
-from fastapi import APIRouter, Depends, status
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
-from src.auth.dependencies import AccessTokenBearer, RoleChecker
+from src.auth.dependencies import RoleChecker, access_token_bearer, get_read_session
 from src.books.service import BookService
+from src.config import Config
 from src.db.main import get_session
+from src.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.db.replicas import mark_user_write
 from src.errors import BookNotFound
-
-from .schemas import Book, BookCreateModel, BookDetailModel, BookUpdateModel
+from src.reviews.schemas import ReviewPage
+from src.reviews.service import ReviewService
+from src.serializers import json_response
+
+from .bulk import iter_bulk_items
+from .schemas import (
+    Book,
+    BookBulkReport,
+    BookCreateModel,
+    BookDetailModel,
+    BookPage,
+    BookUpdateModel,
+)
 
 book_router = APIRouter()
 book_service = BookService()
-access_token_bearer = AccessTokenBearer()
+review_service = ReviewService()
 role_checker = RoleChecker(["admin", "user"])
 
 
-@book_router.get("/", response_model=list[Book])
+@book_router.get("/", response_model=BookPage)
 async def get_all_books(
-    session: AsyncSession = Depends(get_session),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
     token_details: dict = Depends(access_token_bearer),
     _: bool = Depends(role_checker),
 ):
-    books = await book_service.get_all_books(session)
-    return books
+    books, next_cursor = await book_service.get_all_books(session, limit, cursor)
+    return json_response({"items": books, "next_cursor": next_cursor})
 
 
 @book_router.get(
     "/user/{user_uid}",
-    response_model=list[Book],
+    response_model=BookPage,
 )
 async def get_user_books(
     user_uid: str,
-    session: AsyncSession = Depends(get_session),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
     token_details: dict = Depends(access_token_bearer),
 ):
-    books = await book_service.get_user_books(user_uid, session)
-    return books
+    books, next_cursor = await book_service.get_user_books(
+        user_uid, session, limit, cursor
+    )
+    return json_response({"items": books, "next_cursor": next_cursor})
+
+
+@book_router.get("/search", response_model=BookPage)
+async def search_books(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    token_details: dict = Depends(access_token_bearer),
+):
+    books, next_cursor = await book_service.search(q, session, limit, cursor)
+    return json_response({"items": books, "next_cursor": next_cursor})
 
 
 @book_router.post("/", status_code=status.HTTP_201_CREATED, response_model=Book)
@@ -46,23 +81,58 @@ async def create_book(
 ) -> Book:
     user_uid = token_details.get("user")["user_uid"]
     new_book = await book_service.create_book(book_data, user_uid, session)
+    await mark_user_write(user_uid)
     return new_book
 
 
+@book_router.post("/bulk", response_model=BookBulkReport)
+async def create_books_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    token_details=Depends(access_token_bearer),
+):
+    """
+    Create many books from a JSON array or an NDJSON body
+    (Content-Type: application/x-ndjson) of BookCreateModel items.
+    """
+    user_uid = token_details.get("user")["user_uid"]
+    report = await book_service.create_books_bulk(
+        iter_bulk_items(request), user_uid, session, Config.BULK_INSERT_CHUNK_SIZE
+    )
+    await mark_user_write(user_uid)
+    return json_response(report)
+
+
 @book_router.get("/{book_uid}", response_model=BookDetailModel)
 async def get_book(
     book_uid: str,
+    # Primary, not replica: only cache misses query it (see get_book_detail).
     session: AsyncSession = Depends(get_session),
     token_details=Depends(access_token_bearer),
 ) -> BookDetailModel:
-    book = await book_service.get_book(book_uid, session)
+    payload = await book_service.get_book_detail(book_uid, session)
 
-    if book:
-        return book
+    if payload is not None:
+        return Response(content=payload, media_type="application/json")
 
     raise BookNotFound()
 
 
+@book_router.get("/{book_uid}/reviews", response_model=ReviewPage)
+async def get_book_reviews(
+    book_uid: UUID,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    sort: Literal["recent", "rating"] = "recent",
+    session: AsyncSession = Depends(get_read_session),
+    token_details=Depends(access_token_bearer),
+):
+    reviews, next_cursor = await review_service.get_book_reviews(
+        book_uid, session, limit, cursor, sort
+    )
+    return json_response({"items": reviews, "next_cursor": next_cursor})
+
+
 @book_router.patch("/{book_uid}", response_model=Book)
 async def update_book(
     book_uid: str,
@@ -72,9 +142,10 @@ async def update_book(
 ) -> Book:
 
     updated_book = await book_service.update_book(book_uid, book_update_data, session)
+    await mark_user_write(token_details["user"]["user_uid"])
 
     if updated_book:
-        return updated_book
+        return json_response(updated_book)
 
     raise BookNotFound()
 
@@ -87,6 +158,7 @@ async def delete_book(
 ) -> None:
 
     book_to_delete = await book_service.delete_book(book_uid, session)
+    await mark_user_write(token_details["user"]["user_uid"])
 
     if book_to_delete is None:
         raise BookNotFound()
@@ -1,9 +1,11 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 from src.reviews.schemas import ReviewModel
+from src.serializers import rating_average
 
 
 class Book(BaseModel):
@@ -13,6 +15,25 @@ class Book(BaseModel):
     author: str
     created_at: datetime
     updated_at: datetime
+    review_count: int
+    rating_sum: int
+    rating_histogram: list[int]
+
+    @computed_field
+    @property
+    def rating_average(self) -> Optional[float]:
+        return rating_average(self.review_count, self.rating_sum)
+
+
+class BookPage(BaseModel):
+    items: list[Book]
+    next_cursor: Optional[str]
+
+
+class BookBulkReport(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[dict]
 
 
 class BookDetailModel(Book):
@@ -1,26 +1,110 @@
+import logging
+import re
+from typing import AsyncIterator
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import desc, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models import Book
+from src.db.models import SEARCH_CONFIG, Book, Review
+from src.db.pagination import decode_cursor, encode_cursor
+from src.serializers import BOOK_FIELDS, book_detail_to_dict, book_to_dict, dump_json
 
+from .cache import book_detail_cache
 from .schemas import BookCreateModel, BookUpdateModel
 
+BOOK_COLUMNS = [getattr(Book, field) for field in BOOK_FIELDS]
+DETAIL_REVIEWS_LIMIT = 5
+
+search_vector = Book.__table__.c.search_vector
+
+logger = logging.getLogger(__name__)
+
 
 class BookService:
-    async def get_all_books(self, session: AsyncSession):
-        statment = select(Book).order_by(desc(Book.created_at))
+    async def _paginate(self, statment, limit: int, cursor: str | None, session):
+        """Run a keyset-paginated books query ordered by (created_at, uid) desc.
+
+        Returns a (rows, next_cursor) pair where rows are plain dicts ready for
+        `dump_json`; next_cursor is None on the last page.
+        """
+        if cursor is not None:
+            created_at, uid = decode_cursor(cursor)
+            statment = statment.where(
+                tuple_(Book.created_at, Book.uid) < (created_at, uid)
+            )
+
+        statment = statment.order_by(desc(Book.created_at), desc(Book.uid)).limit(
+            limit + 1
+        )
 
         result = await session.exec(statment)
-        return result.all()
+        books = [book_to_dict(row) for row in result.all()]
 
-    async def get_user_books(self, user_uid, session: AsyncSession):
-        statment = (
-            select(Book)
-            .where(Book.user_uid == user_uid)
-            .order_by(desc(Book.created_at))
+        next_cursor = None
+        if len(books) > limit:
+            books = books[:limit]
+            last = books[-1]
+            next_cursor = encode_cursor(last["created_at"], last["uid"])
+
+        return books, next_cursor
+
+    async def get_all_books(
+        self, session: AsyncSession, limit: int, cursor: str | None = None
+    ):
+        statment = select(*BOOK_COLUMNS)
+
+        return await self._paginate(statment, limit, cursor, session)
+
+    async def get_user_books(
+        self, user_uid, session: AsyncSession, limit: int, cursor: str | None = None
+    ):
+        statment = select(*BOOK_COLUMNS).where(Book.user_uid == user_uid)
+
+        return await self._paginate(statment, limit, cursor, session)
+
+    async def search(
+        self,
+        query: str,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+    ):
+        """Ranked full-text search over title, author and description.
+
+        Every word in the query is matched as a prefix. Results are ordered by
+        rank and paged with a (rank, uid) cursor.
+        """
+        terms = re.findall(r"[^\W_]+", query.lower())
+
+        if not terms:
+            return [], None
+
+        tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{t}:*" for t in terms))
+        rank = func.ts_rank_cd(search_vector, tsquery)
+
+        statment = select(*BOOK_COLUMNS, rank.label("rank")).where(
+            search_vector.op("@@")(tsquery)
         )
+
+        if cursor is not None:
+            last_rank, uid = decode_cursor(cursor, (float, UUID))
+            statment = statment.where(tuple_(rank, Book.uid) < (last_rank, uid))
+
+        statment = statment.order_by(desc(rank), desc(Book.uid)).limit(limit + 1)
+
         result = await session.exec(statment)
-        return result.all()
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].uid)
+
+        return [book_to_dict(row) for row in rows], next_cursor
 
     async def create_book(
         self, book_data: BookCreateModel, user_uid: str, session: AsyncSession
@@ -35,6 +119,66 @@ class BookService:
 
         return new_book
 
+    async def _insert_chunk(
+        self, chunk: list[tuple[int, dict]], session: AsyncSession, report: dict
+    ) -> None:
+        try:
+            await session.exec(insert(Book), params=[row for _, row in chunk])
+            await session.commit()
+            report["inserted"] += len(chunk)
+
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.warning("Bulk book chunk failed: %s", e)
+
+            for index, _ in chunk:
+                report["errors"].append({"index": index, "error": "Database error."})
+
+    async def create_books_bulk(
+        self,
+        items: AsyncIterator[bytes | dict],
+        user_uid: str,
+        session: AsyncSession,
+        chunk_size: int,
+    ) -> dict:
+        """Validate items as they arrive and insert them in committed chunks.
+
+        Invalid items and failed chunks are reported by their position in the
+        input without aborting the rest of the batch.
+        """
+        report = {"inserted": 0, "errors": []}
+        chunk: list[tuple[int, dict]] = []
+        index = 0
+
+        async for item in items:
+            try:
+                if isinstance(item, bytes):
+                    book_data = BookCreateModel.model_validate_json(item)
+                else:
+                    book_data = BookCreateModel.model_validate(item)
+
+            except ValidationError as e:
+                errors = e.errors(
+                    include_url=False, include_context=False, include_input=False
+                )
+                report["errors"].append({"index": index, "error": errors})
+
+            else:
+                chunk.append((index, {**book_data.model_dump(), "user_uid": user_uid}))
+
+                if len(chunk) >= chunk_size:
+                    await self._insert_chunk(chunk, session, report)
+                    chunk = []
+
+            index += 1
+
+        if chunk:
+            await self._insert_chunk(chunk, session, report)
+
+        report["failed"] = len(report["errors"])
+
+        return report
+
     async def get_book(self, book_uid: str, session: AsyncSession):
         statment = select(Book).where(Book.uid == book_uid)
 
@@ -44,28 +188,82 @@ class BookService:
 
         return book if book is not None else None
 
+    async def get_book_detail(self, book_uid: str, session: AsyncSession):
+        """Serialized BookDetailModel for a book, served from cache when possible.
+
+        Only the latest DETAIL_REVIEWS_LIMIT reviews are embedded; the total is
+        in review_count and the rest are paged through /books/{uid}/reviews.
+        `session` must be on the primary: a miss right after an invalidation
+        would otherwise cache a lagging replica's old row for the full TTL.
+        """
+        try:
+            book_uid = UUID(book_uid)
+
+        except ValueError:
+            return None
+
+        async def load():
+            book = await self.get_book(book_uid, session)
+
+            if book is None:
+                return None
+
+            statment = (
+                select(Review)
+                .where(Review.book_uid == book.uid)
+                .order_by(desc(Review.created_at), desc(Review.uid))
+                .limit(DETAIL_REVIEWS_LIMIT)
+            )
+            result = await session.exec(statment)
+
+            return dump_json(book_detail_to_dict(book, result.all()))
+
+        return await book_detail_cache.get_or_load(book_uid, load)
+
     async def update_book(
         self, book_uid: str, update_data: BookUpdateModel, session: AsyncSession
     ):
-        book_to_update = await self.get_book(book_uid, session)
-
-        if book_to_update is not None:
-            update_data_dict = update_data.model_dump()
+        statment = (
+            update(Book)
+            .where(Book.uid == book_uid)
+            .values(**update_data.model_dump(), updated_at=func.now())
+            .returning(*BOOK_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
 
-            for k, v in update_data_dict.items():
-                setattr(book_to_update, k, v)
+        result = await session.exec(statment)
+        updated_book = result.first()
+        await session.commit()
 
-            await session.commit()
+        if updated_book is None:
+            return None
 
-            return book_to_update
+        await book_detail_cache.invalidate(book_uid)
 
-        return None
+        return book_to_dict(updated_book)
 
     async def delete_book(self, book_uid: str, session: AsyncSession):
-        book_to_delete = await self.get_book(book_uid, session)
+        # Detach the book's reviews in the same statement, as the ORM delete did.
+        detached_reviews = (
+            update(Review)
+            .where(Review.book_uid == book_uid)
+            .values(book_uid=None)
+            .returning(Review.uid)
+            .cte("detached_reviews")
+        )
+        statment = (
+            delete(Book)
+            .where(Book.uid == book_uid)
+            .returning(Book.uid)
+            .add_cte(detached_reviews)
+            .execution_options(synchronize_session=False)
+        )
 
-        if book_to_delete is not None:
-            await session.delete(book_to_delete)
-            await session.commit()
+        result = await session.exec(statment)
+        deleted_uid = result.scalar_one_or_none()
+        await session.commit()
+
+        if deleted_uid is not None:
+            await book_detail_cache.invalidate(book_uid)
 
-        return None
+        return deleted_uid
@@ -1,16 +1,69 @@
 from celery import Celery
-from src.mail import mail, create_message
-from asgiref.sync import async_to_sync
+from celery.signals import (
+    after_task_publish,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from src.mail_templates import mail_templates, raw_message
+from src.metrics import metrics
+from src.smtp_pool import build_email, mail_loop
 
 c_app = Celery()
 
 c_app.config_from_object("src.config")
 
 
-@c_app.task()
-def send_email_celery(recipients: list[str], subject: str, body: str):
+@after_task_publish.connect
+def count_published_task(sender=None, **kwargs):
+    metrics.inc("celery_tasks_published_total", {"task": sender})
 
-    message = create_message(recipients=recipients, subject=subject, body=body)
 
-    async_to_sync(mail.send_message)(message)
-    print("Email sent")
\ No newline at end of file
+@worker_process_init.connect
+def start_mail_loop(**kwargs):
+    mail_templates.load()
+    mail_loop.start()
+
+
+@worker_process_shutdown.connect
+def stop_mail_loop(**kwargs):
+    mail_loop.stop()
+
+
+@c_app.task(bind=True, ignore_result=True, max_retries=3, default_retry_delay=30)
+def send_template_mail(self, template: str, messages: list[dict]):
+    """Render `template` for each {recipients, context} message and send them.
+
+    A message may override the template's subject with its own "subject".
+    Only the messages that failed are retried.
+    """
+    subject = mail_templates.subject(template)
+    bodies = mail_templates.render_batch(
+        template, [message["context"] for message in messages]
+    )
+    failed = mail_loop.send(
+        [
+            build_email(message["recipients"], message.get("subject") or subject, body)
+            for message, body in zip(messages, bodies)
+        ]
+    )
+
+    if failed:
+        raise self.retry(args=[template, [messages[index] for index in failed]])
+
+
+# Shims for tasks published before send_template_mail existed, still queued or
+# sent by API processes not yet upgraded. Remove after the next release.
+@c_app.task(bind=True, ignore_result=True)
+def send_email_celery(self, recipients: list[str], subject: str, body: str):
+    send_template_mail.apply_async(
+        args=["raw", [raw_message(recipients, subject, body)]],
+        priority=(self.request.delivery_info or {}).get("priority"),
+    )
+
+
+@c_app.task(bind=True, ignore_result=True)
+def send_email_batch(self, messages: list[dict]):
+    send_template_mail.apply_async(
+        args=["raw", [raw_message(**message) for message in messages]],
+        priority=(self.request.delivery_info or {}).get("priority"),
+    )
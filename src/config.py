@@ -3,6 +3,27 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_HEALTH_INTERVAL: int = 10
+    DB_READ_STICKINESS_SECONDS: int = 5
+    BOOK_CACHE_TTL: int = 300
+    BOOK_CACHE_L1_TTL: float = 5
+    BOOK_CACHE_L1_SIZE: int = 1024
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_QUEUE_SIZE: int = 10000
+    ACCESS_LOG_BATCH_SIZE: int = 500
+    ACCESS_LOG_FLUSH_INTERVAL: float = 1.0
+    METRICS_DIR: str = ""
+    METRICS_FLUSH_INTERVAL: float = 5
+    DB_SLOW_QUERY_MS: float = 200
     JWT_SECRET: str
     JWT_ALGORITHM: str
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -18,7 +39,26 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = False
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+    MAIL_POOL_SIZE: int = 2
+    MAIL_TIMEOUT: float = 30
+    MAIL_BATCH_SIZE: int = 100
+    PASSWORD_RESET_DEDUP_SECONDS: int = 300
+    OUTBOX_RELAY_IN_APP: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1
     DOMAIN: str
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_BLOCKLIST_MIRROR: bool = True
+    # "<requests>/<seconds>" per client IP and per submitted email
+    RATE_LIMIT_LOGIN_IP: str = "20/60"
+    RATE_LIMIT_LOGIN_EMAIL: str = "5/60"
+    RATE_LIMIT_SIGNUP_IP: str = "10/3600"
+    RATE_LIMIT_SIGNUP_EMAIL: str = "3/3600"
+    RATE_LIMIT_PASSWORD_RESET_IP: str = "10/3600"
+    RATE_LIMIT_PASSWORD_RESET_EMAIL: str = "3/3600"
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -30,4 +70,11 @@ Config = Settings()
 
 broker_url = Config.REDIS_URL
 result_backend = Config.REDIS_URL
-broker_connection_retry_on_startup = True
\ No newline at end of file
+broker_connection_retry_on_startup = True
+# The Redis transport keeps one list per priority step and serves
+# apply_async(priority=...) 0 first.
+broker_transport_options = {"priority_steps": list(range(10))}
+# Priorities only apply to tasks still in the broker. Reserve nothing beyond
+# the running task, so a password reset queued behind bulk batches is next.
+worker_prefetch_multiplier = 1
+task_acks_late = True
\ No newline at end of file
@@ -1,16 +1,63 @@
-from sqlalchemy.ext.asyncio import AsyncEngine
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
 from src.db.models import Book
+from src.db.query_stats import instrument_engine
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers waited for a connection."""
+
+    wait_count = 0
+    wait_seconds = 0.0
+    max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
 
-engine = AsyncEngine(
-    create_engine(
-        url=Config.DATABASE_URL,
+        try:
+            return super()._do_get()
+
+        finally:
+            waited = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+def build_engine(url: str):
+    engine = create_async_engine(
+        url,
         echo=False,
+        poolclass=TimedQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args={
+            # asyncpg's own statement cache; set to 0 behind pgbouncer
+            "statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE,
+            # prepared statement cache kept by SQLAlchemy's asyncpg adapter
+            "prepared_statement_cache_size": Config.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
     )
+    instrument_engine(engine)
+    return engine
+
+
+engine = build_engine(Config.DATABASE_URL)
+
+Session = sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
 )
 
 
@@ -21,12 +68,24 @@ async def init_db() -> None:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def get_session() -> AsyncSession:
-    Session = sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+async def close_db() -> None:
+    await engine.dispose()
+
 
+def get_pool_stats(pool=None) -> dict:
+    pool = pool if pool is not None else engine.pool
+
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "wait_count": pool.wait_count,
+        "wait_seconds": pool.wait_seconds,
+        "max_wait_seconds": pool.max_wait_seconds,
+    }
+
+
+async def get_session() -> AsyncSession:
     async with Session() as session:
         yield session
@@ -3,11 +3,24 @@ from typing import Optional
 from uuid import UUID, uuid4
 
 import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import Computed, Index, text
 from sqlmodel import Column, Field, Relationship, SQLModel
 
+# Reviews are rated 1..RATING_BUCKETS; Book.rating_histogram has one slot per rating.
+RATING_BUCKETS = 4
+
+SEARCH_CONFIG = "english"
+BOOK_SEARCH_DOCUMENT = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(author, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_email", "email", unique=True),)
+
     uid: UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid4)
     )
@@ -22,11 +35,12 @@ class User(SQLModel, table=True):
     password_hash: str = Field(exclude=True)
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now()))
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now()))
+    # Loaded only when a call site asks for them (see UserService.get_user_by_email)
     books: list["Book"] = Relationship(
-        back_populates="user", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="user", sa_relationship_kwargs={"lazy": "raise"}
     )
     reviews: list["Review"] = Relationship(
-        back_populates="user", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="user", sa_relationship_kwargs={"lazy": "raise"}
     )
 
     def __repr__(self):
@@ -35,6 +49,19 @@ class User(SQLModel, table=True):
 
 class Book(SQLModel, table=True):
     __tablename__ = "books"
+    __table_args__ = (
+        # Full-text search document, only used by BookService.search. It lives on
+        # the table but is excluded from the mapper so entity loads skip it.
+        Column(
+            "search_vector",
+            pg.TSVECTOR,
+            Computed(BOOK_SEARCH_DOCUMENT, persisted=True),
+        ),
+        Index("ix_books_created_at_uid", "created_at", "uid"),
+        Index("ix_books_user_uid_created_at_uid", "user_uid", "created_at", "uid"),
+        Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     uid: UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid4)
@@ -45,10 +72,26 @@ class Book(SQLModel, table=True):
     user_uid: Optional[UUID] = Field(default=None, foreign_key="users.uid")
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
     updated_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
-    
+    # Maintained by ReviewService.add_review in the review's transaction
+    review_count: int = Field(
+        default=0, sa_column=Column(pg.INTEGER, nullable=False, server_default="0")
+    )
+    rating_sum: int = Field(
+        default=0, sa_column=Column(pg.INTEGER, nullable=False, server_default="0")
+    )
+    rating_histogram: list[int] = Field(
+        default_factory=lambda: [0] * RATING_BUCKETS,
+        sa_column=Column(
+            pg.ARRAY(pg.INTEGER),
+            nullable=False,
+            server_default="{" + ",".join(["0"] * RATING_BUCKETS) + "}",
+        ),
+    )
+
     user: Optional["User"] = Relationship(back_populates="books")
+    # Never loaded whole; see BookService.get_book_detail and /books/{uid}/reviews
     reviews: list["Review"] = Relationship(
-        back_populates="book", sa_relationship_kwargs={"lazy": "selectin"}
+        back_populates="book", sa_relationship_kwargs={"lazy": "raise"}
     )
 
     def __repr__(self):
@@ -57,11 +100,16 @@ class Book(SQLModel, table=True):
 
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_book_uid_created_at_uid", "book_uid", "created_at", "uid"),
+        Index("ix_reviews_book_uid_rating", "book_uid", "rating", "created_at", "uid"),
+        Index("ix_reviews_user_uid", "user_uid"),
+    )
 
     uid: UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid4)
     )
-    rating: int = Field(lt=5)
+    rating: int = Field(ge=1, le=RATING_BUCKETS)
     user_uid: Optional[UUID] = Field(default=None, foreign_key="users.uid")
     book_uid: Optional[UUID] = Field(default=None, foreign_key="books.uid")
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
@@ -71,3 +119,36 @@ class Review(SQLModel, table=True):
 
     def __repr__(self):
         return f"<Review for {self.book_uid} by {self.user_uid}>"
+
+
+class OutboxMessage(SQLModel, table=True):
+    """Side effect recorded in the transaction that caused it.
+
+    Rows are published and deleted by the relay in src/outbox.py; rows it
+    cannot publish are kept with failed_at and error set for inspection.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending_created_at",
+            "created_at",
+            postgresql_where=text("failed_at IS NULL"),
+        ),
+    )
+
+    uid: UUID = Field(
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid4)
+    )
+    topic: str
+    payload: dict = Field(sa_column=Column(pg.JSONB, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.now)
+    )
+    failed_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(pg.TIMESTAMP, nullable=True)
+    )
+    error: Optional[str] = None
+
+    def __repr__(self):
+        return f"<OutboxMessage {self.topic} {self.uid}>"
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from src.errors import InvalidCursor
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Converters for the default (created_at, uid) keyset
+CREATED_AT_UID = (datetime.fromisoformat, UUID)
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    if isinstance(value, UUID):
+        return str(value)
+
+    return value
+
+
+def encode_cursor(*values) -> str:
+    """Build an opaque cursor from the keyset values of the last row of a page."""
+    raw = json.dumps([_to_json(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, converters=CREATED_AT_UID) -> tuple:
+    """Unpack a cursor produced by `encode_cursor`, converting each value."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+        if len(values) != len(converters):
+            raise ValueError("Cursor has the wrong number of values")
+
+        return tuple(convert(value) for convert, value in zip(converters, values))
+
+    except (ValueError, TypeError):
+        raise InvalidCursor()
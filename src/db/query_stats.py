@@ -0,0 +1,123 @@
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\([^)]+\)s|%s")
+_VALUE_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """Queries issued while handling one request (or one `query_budget` block).
+
+    Blocks nest: queries are also counted on every enclosing `QueryStats`, so a
+    budget wrapped around an in-process client call sees the request's queries.
+    """
+
+    def __init__(self, parent: "QueryStats | None" = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: list[str] = []
+
+    @property
+    def milliseconds(self) -> float:
+        return round(self.seconds * 1000, 3)
+
+
+# SQLAlchemy runs cursor events in a greenlet that shares the calling task's
+# context, so the listeners below see the stats of the request being served.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def normalize_sql(statement: str) -> str:
+    """Strip literals and bind parameters so equivalent statements compare equal."""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _VALUE_LIST.sub("(...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+# The start time lives on the per-statement execution context rather than the
+# connection: after_cursor_execute never runs for a failing statement, and
+# anything kept on the pooled connection would outlive it.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+    stats = current_query_stats.get()
+
+    while stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.statements.append(statement)
+        stats = stats.parent
+
+    if elapsed * 1000 >= Config.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s", elapsed * 1000, normalize_sql(statement)
+        )
+
+
+def instrument_engine(engine) -> None:
+    """Attach the query counting listeners to an async engine."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries():
+    """Collect the queries issued inside the block into a fresh `QueryStats`."""
+    stats = QueryStats(parent=current_query_stats.get())
+    token = current_query_stats.set(stats)
+
+    try:
+        yield stats
+
+    finally:
+        current_query_stats.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """Fail if the block issues more than `max_queries` statements.
+
+    Meant for tests, e.g. guarding an endpoint against N+1 regressions:
+
+        with query_budget(3):
+            await client.get("/api/v1/books/")
+    """
+    with track_queries() as stats:
+        yield stats
+
+    if stats.count > max_queries:
+        statements = "\n".join(normalize_sql(s) for s in stats.statements)
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {stats.count}:\n{statements}"
+        )
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+    """Check the X-DB-Query-Count header of a response against a budget."""
+    count = int(response.headers["X-DB-Query-Count"])
+
+    if count > max_queries:
+        raise AssertionError(
+            f"{response.request.method} {response.request.url.path} issued "
+            f"{count} queries, budget is {max_queries}"
+        )
@@ -1,17 +1,155 @@
+import asyncio
+import logging
+import time
+
 from redis import asyncio as aioredis
 
 from src.config import Config
+from src.metrics import metrics
 
 JTI_EXPIRY = 3600
+BLOCKLIST_PREFIX = "blocklist:"
+BLOCKLIST_CHANNEL = "blocklist"
+BLOCKLIST_PRUNE_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
+
+
+class TimedRedis(aioredis.Redis):
+    """Redis client that records the latency of every command it sends."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+
+        try:
+            return await super().execute_command(*args, **options)
+
+        finally:
+            metrics.observe(
+                "redis_command_duration_seconds",
+                {"command": str(args[0]).upper()},
+                time.perf_counter() - start,
+            )
+
+
+token_blocklist = TimedRedis.from_url(Config.REDIS_URL)
+
+
+class BlocklistMirror:
+    """In-process copy of the revoked JTIs stored in Redis.
+
+    It is filled by a SCAN at startup and kept current through the
+    BLOCKLIST_CHANNEL pub/sub channel, so lookups for tokens that were never
+    revoked don't leave the process. Until the mirror is ready (or after the
+    subscription drops) lookups fall back to Redis.
+    """
+
+    def __init__(self, redis: aioredis.Redis) -> None:
+        self.ready = False
+        self._redis = redis
+        self._revoked: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def add(self, jti: str, ttl: float = JTI_EXPIRY) -> None:
+        self._revoked[jti] = time.monotonic() + ttl
+
+    def contains(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+
+        if expires_at is None:
+            return False
+
+        if expires_at <= time.monotonic():
+            del self._revoked[jti]
+            return False
+
+        return True
 
+    def prune(self) -> None:
+        now = time.monotonic()
+        self._revoked = {
+            jti: expires_at
+            for jti, expires_at in self._revoked.items()
+            if expires_at > now
+        }
 
-token_blocklist = aioredis.from_url(Config.REDIS_URL)
+    async def _warm_up(self) -> None:
+        keys = [
+            key
+            async for key in self._redis.scan_iter(
+                match=f"{BLOCKLIST_PREFIX}*", count=1000
+            )
+        ]
+
+        for start in range(0, len(keys), 1000):
+            batch = keys[start : start + 1000]
+
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in batch:
+                    pipe.ttl(key)
+                ttls = await pipe.execute()
+
+            for key, ttl in zip(batch, ttls):
+                if ttl > 0:
+                    self.add(key.decode()[len(BLOCKLIST_PREFIX) :], ttl)
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+
+            try:
+                # Subscribe before scanning so no revocation falls in between.
+                await pubsub.subscribe(BLOCKLIST_CHANNEL)
+                await self._warm_up()
+                self.ready = True
+
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=BLOCKLIST_PRUNE_INTERVAL,
+                    )
+
+                    if message is None:
+                        self.prune()
+                    elif message["type"] == "message":
+                        self.add(message["data"].decode())
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.warning("Blocklist subscription lost: %s", e)
+                self.ready = False
+                await asyncio.sleep(1)
+
+            finally:
+                await pubsub.aclose()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        self.ready = False
+
+
+blocklist_mirror = BlocklistMirror(token_blocklist)
 
 
 async def add_jti_to_blocklist(jti: str) -> None:
-    await token_blocklist.set(name=jti, value="", ex=JTI_EXPIRY)
+    await token_blocklist.set(name=f"{BLOCKLIST_PREFIX}{jti}", value="", ex=JTI_EXPIRY)
+    await token_blocklist.publish(BLOCKLIST_CHANNEL, jti)
+
+    blocklist_mirror.add(jti)
 
 
 async def token_in_blocklist(jti: str) -> bool:
-    jti = await token_blocklist.get(jti)
+    if blocklist_mirror.ready:
+        return blocklist_mirror.contains(jti)
+
+    jti = await token_blocklist.get(f"{BLOCKLIST_PREFIX}{jti}")
     return jti is not None
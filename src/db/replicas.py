@@ -0,0 +1,183 @@
+import asyncio
+import itertools
+import logging
+import time
+
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import Config
+from src.db.main import Session, build_engine
+from src.db.redis_client import token_blocklist as redis
+
+STICKY_CHANNEL = "db:sticky"
+HEALTH_CHECK_TIMEOUT = 2
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.engine = build_engine(url)
+        self.session_maker = sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        self.healthy = True
+
+
+class ReplicaSet:
+    """Round-robin over the read replicas that passed their last health check."""
+
+    def __init__(self, urls: list[str]) -> None:
+        self.replicas = [Replica(url) for url in urls]
+        self._counter = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+
+    def pick(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+
+        if not healthy:
+            return None
+
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def _ping(self, replica: Replica) -> None:
+        async with replica.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                # Bound connecting as well, a hung replica may never accept.
+                await asyncio.wait_for(
+                    self._ping(replica), timeout=HEALTH_CHECK_TIMEOUT
+                )
+                replica.healthy = True
+
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning("Replica %s is unhealthy: %s", replica.engine.url, e)
+
+                replica.healthy = False
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(Config.DB_REPLICA_HEALTH_INTERVAL)
+
+    def start(self) -> None:
+        if self.replicas and not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run()),
+                asyncio.create_task(_follow_writes()),
+            ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks = []
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_set = ReplicaSet(
+    [url.strip() for url in Config.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+)
+
+# user_uid -> monotonic deadline of the read-your-writes window
+_recent_writers: dict[str, float] = {}
+
+
+def _remember_write(user_uid: str) -> None:
+    _recent_writers[user_uid] = time.monotonic() + Config.DB_READ_STICKINESS_SECONDS
+
+
+def _prune_writes() -> None:
+    now = time.monotonic()
+
+    for user_uid, expires_at in list(_recent_writers.items()):
+        if expires_at <= now:
+            del _recent_writers[user_uid]
+
+
+async def mark_user_write(user_uid: str) -> None:
+    """Pin the user's reads to the primary for DB_READ_STICKINESS_SECONDS.
+
+    The window is kept in process and broadcast on STICKY_CHANNEL so the other
+    workers record it too; reads then never wait on Redis.
+    """
+    if not replica_set.replicas:
+        return
+
+    _remember_write(user_uid)
+
+    try:
+        await redis.publish(STICKY_CHANNEL, user_uid)
+
+    except RedisError as e:
+        # The write is committed; only other workers may read a stale replica.
+        logger.warning("Could not broadcast write by %s: %s", user_uid, e)
+
+
+async def _follow_writes() -> None:
+    while True:
+        pubsub = redis.pubsub()
+
+        try:
+            await pubsub.subscribe(STICKY_CHANNEL)
+            next_prune = time.monotonic() + Config.DB_READ_STICKINESS_SECONDS
+
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=Config.DB_READ_STICKINESS_SECONDS,
+                )
+
+                if message is not None and message["type"] == "message":
+                    _remember_write(message["data"].decode())
+
+                if time.monotonic() >= next_prune:
+                    _prune_writes()
+                    next_prune = time.monotonic() + Config.DB_READ_STICKINESS_SECONDS
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            logger.warning("Read stickiness subscription lost: %s", e)
+            await asyncio.sleep(1)
+
+        finally:
+            await pubsub.aclose()
+
+
+def _wrote_recently(user_uid: str) -> bool:
+    expires_at = _recent_writers.get(user_uid)
+
+    if expires_at is None:
+        return False
+
+    if expires_at <= time.monotonic():
+        del _recent_writers[user_uid]
+        return False
+
+    return True
+
+
+async def get_read_session_maker(user_uid: str | None = None) -> sessionmaker:
+    """Return a replica session factory, or the primary's when none is usable."""
+    if not replica_set.replicas:
+        return Session
+
+    if user_uid is not None and _wrote_recently(user_uid):
+        return Session
+
+    replica = replica_set.pick()
+
+    return replica.session_maker if replica is not None else Session
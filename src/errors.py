@@ -76,6 +76,24 @@ class UserNotFound(BooklyException):
     pass
 
 
+class PasswordHashingBusy(BooklyException):
+    """Too many password hashing operations are already queued"""
+
+    pass
+
+
+class InvalidCursor(BooklyException):
+    """User has provided a malformed pagination cursor"""
+
+    pass
+
+
+class InvalidBulkPayload(BooklyException):
+    """User has provided a bulk body that is not a JSON array or NDJSON"""
+
+    pass
+
+
 class AccountNotVerified(Exception):
     """Account not yet verified"""
 
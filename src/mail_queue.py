@@ -0,0 +1,65 @@
+import asyncio
+
+from src.celery_tasks import send_template_mail
+from src.config import Config
+from src.db.redis_client import token_blocklist as redis
+
+# Celery's Redis transport serves lower numbers first.
+PRIORITY_PASSWORD_RESET = 0
+PRIORITY_VERIFICATION = 3
+PRIORITY_BULK = 9
+
+MAIL_DEDUP_PREFIX = "mail:dedup:"
+
+
+async def enqueue_mail(
+    template: str,
+    recipients: list[str],
+    context: dict,
+    priority: int = PRIORITY_BULK,
+    dedup_key: str | None = None,
+    dedup_seconds: int = 0,
+) -> bool:
+    """Queue one email rendered from a template in src/mail_templates.py.
+
+    With a `dedup_key`, only the first request in `dedup_seconds` is queued and
+    later ones return False.
+    """
+    dedup_marker = None
+
+    if dedup_key is not None:
+        dedup_marker = f"{MAIL_DEDUP_PREFIX}{dedup_key}"
+        first = await redis.set(dedup_marker, "", nx=True, ex=dedup_seconds)
+
+        if not first:
+            return False
+
+    try:
+        await enqueue_mail_batch(
+            template, [{"recipients": recipients, "context": context}], priority
+        )
+
+    except Exception:
+        # Nothing was queued, so a retry must not be treated as a duplicate.
+        if dedup_marker is not None:
+            await redis.delete(dedup_marker)
+
+        raise
+
+    return True
+
+
+async def enqueue_mail_batch(
+    template: str, messages: list[dict], priority: int = PRIORITY_BULK
+) -> None:
+    """Queue {recipients, context} messages, MAIL_BATCH_SIZE per task.
+
+    The worker renders each task's messages with one compiled template.
+    """
+    for start in range(0, len(messages), Config.MAIL_BATCH_SIZE):
+        # Publishing talks to the broker synchronously, keep it off the event loop.
+        await asyncio.to_thread(
+            send_template_mail.apply_async,
+            args=[template, messages[start : start + Config.MAIL_BATCH_SIZE]],
+            priority=priority,
+        )
@@ -0,0 +1,52 @@
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+from src.mail import mail_config
+
+# template name -> subject; the body is src/templates/<name>.html
+MAIL_TEMPLATES = {
+    "verify_email": "Verify Your email",
+    "password_reset": "Reset password.",
+    "welcome": "Welcome email.",
+    # Pre-rendered {"body": html}; the message carries its own subject.
+    "raw": "",
+}
+
+
+def raw_message(recipients: list[str], subject: str, body: str) -> dict:
+    """A "raw" template message for mail rendered before templates existed."""
+    return {"recipients": recipients, "subject": subject, "context": {"body": body}}
+
+
+class TemplateRegistry:
+    """Mail templates compiled once per process and reused for every message."""
+
+    def __init__(self, folder) -> None:
+        self._env = Environment(
+            loader=FileSystemLoader(folder),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+        )
+        self._templates: dict[str, Template] = {}
+
+    def load(self) -> None:
+        for name in MAIL_TEMPLATES:
+            self._templates[name] = self._env.get_template(f"{name}.html")
+
+    def get(self, name: str) -> Template:
+        if not self._templates:
+            self.load()
+
+        return self._templates[name]
+
+    def subject(self, name: str) -> str:
+        return MAIL_TEMPLATES[name]
+
+    def render(self, name: str, context: dict) -> str:
+        return self.get(name).render(context)
+
+    def render_batch(self, name: str, contexts: list[dict]) -> list[str]:
+        template = self.get(name)
+        return [template.render(context) for context in contexts]
+
+
+mail_templates = TemplateRegistry(mail_config.TEMPLATE_FOLDER)
@@ -0,0 +1,256 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from src.config import Config
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+
+def _labels_text(labels: dict | None) -> str:
+    if not labels:
+        return ""
+
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in sorted(labels.items())
+    )
+    return "{" + pairs + "}"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+
+    except ProcessLookupError:
+        return False
+
+    except PermissionError:
+        pass
+
+    return True
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms rendered in Prometheus text format.
+
+    Every worker keeps its own samples in memory. When `directory` is set, a
+    background task periodically writes them to `<directory>/<pid>.json` and a
+    scrape merges the files of all workers: counters and histograms are summed
+    (including those of workers that have exited), gauges are summed over live
+    workers only. Clear the directory when the service is (re)deployed.
+    """
+
+    def __init__(self, directory: str = "", flush_interval: float = 5) -> None:
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._types: dict[str, str] = {}
+        self._counters: dict[tuple[str, str], float] = defaultdict(float)
+        self._gauges: dict[tuple[str, str], float] = defaultdict(float)
+        self._histograms: dict[tuple[str, str], list] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+        # Samples are also updated from threads, e.g. Celery's publish signal
+        # fires in the to_thread worker that publishes.
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, labels: dict | None = None, value: float = 1) -> None:
+        key = (name, _labels_text(labels))
+
+        with self._lock:
+            self._types[name] = "counter"
+            self._counters[key] += value
+
+    def set_gauge(
+        self, name: str, labels: dict | None = None, value: float = 0
+    ) -> None:
+        key = (name, _labels_text(labels))
+
+        with self._lock:
+            self._types[name] = "gauge"
+            self._gauges[key] = value
+
+    def add_gauge(
+        self, name: str, labels: dict | None = None, value: float = 1
+    ) -> None:
+        key = (name, _labels_text(labels))
+
+        with self._lock:
+            self._types[name] = "gauge"
+            self._gauges[key] += value
+
+    def observe(self, name: str, labels: dict | None = None, value: float = 0) -> None:
+        key = (name, _labels_text(labels))
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, value)
+
+        with self._lock:
+            self._types[name] = "histogram"
+            histogram = self._histograms.get(key)
+
+            if histogram is None:
+                # one slot per bucket plus +Inf, then sum
+                histogram = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+                self._histograms[key] = histogram
+
+            histogram[bucket] += 1
+            histogram[-1] += value
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callable that refreshes gauges right before they are read."""
+        self._collectors.append(collector)
+
+    def _collect(self) -> None:
+        for collector in self._collectors:
+            try:
+                collector()
+
+            except Exception as e:
+                logger.warning("Metrics collector %r failed: %s", collector, e)
+
+    def snapshot(self) -> dict:
+        """Copy of this process's samples, safe to write or render from a thread.
+
+        Collectors read loop-owned state, so call this on the event loop.
+        """
+        self._collect()
+
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "types": dict(self._types),
+                "counters": [[*key, value] for key, value in self._counters.items()],
+                "gauges": [[*key, value] for key, value in self._gauges.items()],
+                "histograms": [
+                    [*key, list(value)] for key, value in self._histograms.items()
+                ],
+            }
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def write_snapshot(self, snapshot: dict) -> None:
+        path = self._snapshot_path(snapshot["pid"])
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+
+        os.replace(tmp_path, path)
+
+    def _read_snapshots(self, own: dict) -> list[dict]:
+        snapshots = [own]
+
+        if not self.directory:
+            return snapshots
+
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+
+            if filename == f"{own['pid']}.json":
+                continue
+
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    snapshots.append(json.load(f))
+
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping metrics snapshot %s: %s", filename, e)
+
+        return snapshots
+
+    def render(self, snapshot: dict) -> str:
+        """Prometheus text for `snapshot` merged with the other workers' files."""
+        types: dict[str, str] = {}
+        counters: dict[tuple[str, str], float] = defaultdict(float)
+        gauges: dict[tuple[str, str], float] = defaultdict(float)
+        histograms: dict[tuple[str, str], list] = {}
+
+        for worker in self._read_snapshots(snapshot):
+            types.update(worker["types"])
+            live = worker["pid"] == os.getpid() or _pid_alive(worker["pid"])
+
+            for name, labels, value in worker["counters"]:
+                counters[(name, labels)] += value
+
+            if live:
+                for name, labels, value in worker["gauges"]:
+                    gauges[(name, labels)] += value
+
+            for name, labels, value in worker["histograms"]:
+                merged = histograms.setdefault((name, labels), [0] * len(value))
+                histograms[(name, labels)] = [a + b for a, b in zip(merged, value)]
+
+        lines = []
+
+        for name in sorted(types):
+            lines.append(f"# TYPE {name} {types[name]}")
+
+            for (sample, labels), value in sorted(counters.items()):
+                if sample == name:
+                    lines.append(f"{name}{labels} {value}")
+
+            for (sample, labels), value in sorted(gauges.items()):
+                if sample == name:
+                    lines.append(f"{name}{labels} {value}")
+
+            for (sample, labels), value in sorted(histograms.items()):
+                if sample == name:
+                    lines.extend(self._render_histogram(name, labels, value))
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(name: str, labels: str, histogram: list) -> list[str]:
+        inner = labels[1:-1] + "," if labels else ""
+        lines = []
+        cumulative = 0
+
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram[:-1]):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{inner}le="{bound}"}} {cumulative}')
+
+        lines.append(f"{name}_sum{labels} {histogram[-1]}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+
+            try:
+                await asyncio.to_thread(self.write_snapshot, self.snapshot())
+
+            except Exception as e:
+                logger.warning("Could not write metrics snapshot: %s", e)
+
+    def start(self) -> None:
+        if self.directory and self._task is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+            try:
+                self.write_snapshot(self.snapshot())
+
+            except Exception as e:
+                logger.warning("Could not write metrics snapshot: %s", e)
+
+
+metrics = MetricsRegistry(
+    directory=Config.METRICS_DIR, flush_interval=Config.METRICS_FLUSH_INTERVAL
+)
@@ -7,6 +7,10 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.requests import Request
 from fastapi.responses import JSONResponse
 
+from src.access_log import access_log
+from src.db.query_stats import track_queries
+from src.metrics import metrics
+
 logger = logging.getLogger("uvicorn.access")
 logger.disabled = True
 
@@ -14,14 +18,55 @@ logger.disabled = True
 def register_middleware(app: FastAPI):
     @app.middleware("http")
     async def custom_logging(request: Request, call_next):
-        start_time = time.time()
+        start_time = time.perf_counter()
+        # Stays 500 if the endpoint raises: call_next re-raises its exception.
+        status_code = 500
+        metrics.add_gauge("http_requests_in_flight", {"method": request.method})
+
+        with track_queries() as query_stats:
+            try:
+                response = await call_next(request)
+                status_code = response.status_code
+
+            finally:
+                processing_time = time.perf_counter() - start_time
+                metrics.add_gauge(
+                    "http_requests_in_flight", {"method": request.method}, -1
+                )
+
+                # Label by route template so /books/{book_uid} is one series.
+                route = request.scope.get("route")
+                labels = {
+                    "route": getattr(route, "path", "<unmatched>"),
+                    "method": request.method,
+                    "status": status_code,
+                }
+                metrics.inc("http_requests_total", labels)
+                metrics.observe(
+                    "http_request_duration_seconds", labels, processing_time
+                )
 
-        response = await call_next(request)
+                client = request.client
 
-        processing_time = time.time() - start_time
-        message = f"{request.client.host}:{request.client.port} {request.method} - {request.url.path} - {response.status_code}, done in: {processing_time}s"
+                access_log.record(
+                    {
+                        "ts": time.time(),
+                        "client": f"{client.host}:{client.port}" if client else None,
+                        "method": request.method,
+                        "path": request.url.path,
+                        "status": status_code,
+                        "duration_ms": round(processing_time * 1000, 3),
+                        "db_queries": query_stats.count,
+                        "db_time_ms": query_stats.milliseconds,
+                    }
+                )
 
-        print(message)
+        response.headers["X-DB-Query-Count"] = str(query_stats.count)
+        response.headers["X-DB-Time-Ms"] = str(query_stats.milliseconds)
+        response.headers["Server-Timing"] = (
+            f"db;dur={query_stats.milliseconds}, "
+            f"app;dur={round(processing_time * 1000, 3)}"
+        )
         return response
 
     app.add_middleware(
@@ -0,0 +1,50 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.access_log import access_log
+from src.auth.hashing import password_hasher
+from src.auth.token_cache import token_cache
+from src.books.cache import book_detail_cache
+from src.db.main import engine, get_pool_stats
+from src.db.replicas import replica_set
+from src.metrics import metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+monitoring_router = APIRouter()
+
+
+def _set_gauges(prefix: str, values: dict, labels: dict | None = None) -> None:
+    for key, value in values.items():
+        if isinstance(value, (int, float)):
+            metrics.set_gauge(f"{prefix}_{key}", labels, value)
+
+
+def collect_pool_stats() -> None:
+    _set_gauges("db_pool", get_pool_stats(engine.pool), {"database": "primary"})
+
+    for index, replica in enumerate(replica_set.replicas):
+        labels = {"database": f"replica{index}"}
+        _set_gauges("db_pool", get_pool_stats(replica.engine.pool), labels)
+        metrics.set_gauge("db_replica_healthy", labels, int(replica.healthy))
+
+
+def collect_component_stats() -> None:
+    _set_gauges("password_hasher", password_hasher.metrics())
+    _set_gauges("token_cache", token_cache.metrics())
+    _set_gauges("book_detail_cache", book_detail_cache.metrics())
+    _set_gauges("access_log", access_log.metrics())
+
+
+metrics.add_collector(collect_pool_stats)
+metrics.add_collector(collect_component_stats)
+
+
+@monitoring_router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    # Copy the samples here on the loop; merging the other workers' snapshot
+    # files and rendering happen off it.
+    body = await asyncio.to_thread(metrics.render, metrics.snapshot())
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
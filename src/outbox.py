@@ -0,0 +1,172 @@
+"""Relay publishing outbox rows to the mail queue.
+
+Runs inside the API process when OUTBOX_RELAY_IN_APP is set, or standalone:
+
+    python -m src.outbox
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from src.config import Config
+from src.db.main import Session
+from src.db.models import OutboxMessage
+from src.mail_queue import PRIORITY_BULK, enqueue_mail_batch
+from src.mail_templates import MAIL_TEMPLATES, raw_message
+
+OUTBOX_TOPIC_MAIL = "mail"
+
+logger = logging.getLogger(__name__)
+
+
+def mail_outbox_message(
+    template: str, recipients: list[str], context: dict, priority: int = PRIORITY_BULK
+) -> OutboxMessage:
+    return OutboxMessage(
+        topic=OUTBOX_TOPIC_MAIL,
+        payload={
+            "template": template,
+            "recipients": recipients,
+            "context": context,
+            "priority": priority,
+        },
+    )
+
+
+def mail_job(payload: dict) -> tuple[int, str, dict]:
+    """(priority, template, message) for a mail payload, or ValueError.
+
+    Payloads written before mail templates existed carry a pre-rendered
+    subject and body; they are sent through the "raw" template.
+    """
+    try:
+        recipients = payload["recipients"]
+
+        if "template" in payload:
+            template = payload["template"]
+            message = {"recipients": recipients, "context": payload.get("context", {})}
+        else:
+            template = "raw"
+            message = raw_message(recipients, payload["subject"], payload["body"])
+
+        priority = int(payload.get("priority", PRIORITY_BULK))
+
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Malformed mail payload: {e!r}") from e
+
+    if template not in MAIL_TEMPLATES:
+        raise ValueError(f"Unknown mail template: {template!r}")
+
+    if not isinstance(recipients, list) or not all(
+        isinstance(recipient, str) for recipient in recipients
+    ):
+        raise ValueError(f"Recipients must be a list of strings: {recipients!r}")
+
+    if not isinstance(message["context"], dict):
+        raise ValueError("Mail context must be an object")
+
+    return priority, template, message
+
+
+async def relay_batch(batch_size: int) -> int:
+    """Publish and delete up to `batch_size` of the oldest pending outbox rows.
+
+    Rows that can't be turned into a mail job are marked failed and skipped.
+
+    SKIP LOCKED lets several relays drain the table side by side. Rows are
+    deleted in the same transaction that locked them, only after publishing,
+    so delivery is at-least-once: a crash in between publishes them again.
+    """
+    async with Session() as session:
+        statement = (
+            select(OutboxMessage)
+            .where(OutboxMessage.failed_at.is_(None))
+            .order_by(OutboxMessage.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.exec(statement)
+        rows = result.all()
+
+        if not rows:
+            return 0
+
+        mail_batches = defaultdict(list)
+        relayed = []
+
+        for row in rows:
+            try:
+                if row.topic != OUTBOX_TOPIC_MAIL:
+                    raise ValueError(f"Unknown topic: {row.topic!r}")
+
+                priority, template, message = mail_job(row.payload)
+
+            except ValueError as e:
+                # Set aside so one bad row can't block the rows behind it.
+                logger.warning("Dead-lettering %r: %s", row, e)
+                row.failed_at = datetime.now()
+                row.error = str(e)
+                session.add(row)
+                continue
+
+            mail_batches[(priority, template)].append(message)
+            relayed.append(row.uid)
+
+        for (priority, template), messages in sorted(mail_batches.items()):
+            await enqueue_mail_batch(template, messages, priority=priority)
+
+        if relayed:
+            await session.exec(
+                delete(OutboxMessage).where(OutboxMessage.uid.in_(relayed))
+            )
+
+        await session.commit()
+
+        return len(rows)
+
+
+class OutboxRelay:
+    def __init__(self, batch_size: int, poll_interval: float) -> None:
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: asyncio.Task | None = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                relayed = await relay_batch(self.batch_size)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.warning("Outbox relay failed, retrying: %s", e)
+                relayed = 0
+
+            # Keep going without pause while there is a backlog.
+            if relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+outbox_relay = OutboxRelay(
+    batch_size=Config.OUTBOX_BATCH_SIZE, poll_interval=Config.OUTBOX_POLL_INTERVAL
+)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(outbox_relay.run())
@@ -1,31 +1,39 @@
 from fastapi import APIRouter, Depends, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.auth.dependencies import get_current_user
+from src.auth.dependencies import access_token_bearer
 from src.db.main import get_session
-from src.db.models import User
+from src.db.replicas import mark_user_write
+from src.serializers import json_response
 
-from .schemas import ReviewCreateModel
+from .schemas import ReviewCreateModel, ReviewModel
 from .service import ReviewService
 
-user = Depends(get_current_user)
+token = Depends(access_token_bearer)
 review_router = APIRouter()
 review_service = ReviewService()
 session = Depends(get_session)
 
 
-@review_router.post("/book/{book_uid}", status_code=status.HTTP_201_CREATED)
+@review_router.post(
+    "/book/{book_uid}",
+    status_code=status.HTTP_201_CREATED,
+    response_model=ReviewModel,
+)
 async def create_review(
     book_uid: str,
     review_data: ReviewCreateModel,
-    current_user: User = user,
+    token_details: dict = token,
     session: AsyncSession = session,
 ):
+    user_uid = token_details["user"]["user_uid"]
+
     new_review = await review_service.add_review(
-        user_email=current_user.email,
+        user_uid=user_uid,
         book_uid=book_uid,
         review_data=review_data,
         session=session,
     )
+    await mark_user_write(user_uid)
 
-    return new_review
+    return json_response(new_review, status_code=status.HTTP_201_CREATED)
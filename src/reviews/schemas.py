@@ -15,4 +15,9 @@ class ReviewModel(BaseModel):
 
 
 class ReviewCreateModel(BaseModel):
-    rating: int = Field(lt=5)
+    rating: int = Field(ge=1, lt=5)
+
+
+class ReviewPage(BaseModel):
+    items: list[ReviewModel]
+    next_cursor: Optional[str]
@@ -1,53 +1,207 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+
 from fastapi import status
 from fastapi.exceptions import HTTPException
+from sqlalchemy import insert, literal, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import desc, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.auth.service import UserService
-from src.books.service import BookService
-from src.db.models import Review
+from src.books.cache import book_detail_cache
+from src.db.models import RATING_BUCKETS, Book, Review
+from src.db.pagination import decode_cursor, encode_cursor
+from src.serializers import REVIEW_FIELDS, to_dict
+
+from .schemas import ReviewCreateModel
+
+books_table = Book.__table__
+reviews_table = Review.__table__
+
+REVIEW_COLUMNS = [getattr(Review, field) for field in REVIEW_FIELDS]
+
+# Postgres' default name for the unnamed reviews.user_uid foreign key
+REVIEWS_USER_FK = "reviews_user_uid_fkey"
+
+# sort name -> keyset columns (all descending) and their cursor converters
+REVIEW_SORTS = {
+    "recent": (
+        (Review.created_at, Review.uid),
+        (datetime.fromisoformat, UUID),
+    ),
+    "rating": (
+        (Review.rating, Review.created_at, Review.uid),
+        (int, datetime.fromisoformat, UUID),
+    ),
+}
+
+_histogram_sql = ", ".join(
+    f"count(r.uid) FILTER (WHERE r.rating = {rating})"
+    for rating in range(1, RATING_BUCKETS + 1)
+)
+
+# Taken in its own statement: under READ COMMITTED a statement reads from the
+# snapshot it started with, so an aggregate in the same statement as the lock
+# would miss reviews committed while it waited for the lock.
+LOCK_BOOKS_SQL = text(
+    "SELECT uid FROM books WHERE uid = ANY(:book_uids) ORDER BY uid FOR UPDATE"
+)
 
-from .schemas import ReviewCreateModel, ReviewModel
+RECOMPUTE_AGGREGATES_SQL = text(
+    f"""
+    WITH agg AS (
+        SELECT
+            b.uid,
+            count(r.uid) AS review_count,
+            coalesce(sum(r.rating), 0) AS rating_sum,
+            ARRAY[{_histogram_sql}] AS rating_histogram
+        FROM books b
+        LEFT JOIN reviews r ON r.book_uid = b.uid
+        WHERE b.uid = ANY(:book_uids)
+        GROUP BY b.uid
+    )
+    UPDATE books
+    SET review_count = agg.review_count,
+        rating_sum = agg.rating_sum,
+        rating_histogram = agg.rating_histogram
+    FROM agg
+    WHERE books.uid = agg.uid
+    """
+)
 
-book_service = BookService()
-user_service = UserService()
+
+def _violated_constraint(error: IntegrityError) -> str | None:
+    # asyncpg's exception (with constraint_name) is the cause of the DBAPI one.
+    cause = getattr(error.orig, "__cause__", None)
+    return getattr(cause, "constraint_name", None)
 
 
 class ReviewService:
+    async def get_book_reviews(
+        self,
+        book_uid: UUID,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        sort: str = "recent",
+    ):
+        """Keyset-paginated reviews of a book, newest or highest rated first.
+
+        Returns a (rows, next_cursor) pair; next_cursor is None on the last page.
+        """
+        columns, converters = REVIEW_SORTS[sort]
+
+        statement = select(*REVIEW_COLUMNS).where(Review.book_uid == book_uid)
+
+        if cursor is not None:
+            values = decode_cursor(cursor, converters)
+            statement = statement.where(tuple_(*columns) < values)
+
+        statement = statement.order_by(*(desc(column) for column in columns)).limit(
+            limit + 1
+        )
+
+        result = await session.exec(statement)
+        reviews = [to_dict(row, REVIEW_FIELDS) for row in result.all()]
+
+        next_cursor = None
+        if len(reviews) > limit:
+            reviews = reviews[:limit]
+            last = reviews[-1]
+            next_cursor = encode_cursor(*(last[column.key] for column in columns))
+
+        return reviews, next_cursor
+
     async def add_review(
         self,
-        user_email: str,
+        user_uid: str,
         book_uid: str,
         review_data: ReviewCreateModel,
         session: AsyncSession,
-    ) -> ReviewModel:
+    ) -> dict:
+        """Insert a review and bump the book's rating aggregates in one statement.
+
+        The book UPDATE runs as a CTE the INSERT selects from, so a missing book
+        inserts nothing; a missing user is caught by the reviews.user_uid FK.
+        """
         try:
-            book = await book_service.get_book(book_uid, session)
-            user = await user_service.get_user_by_email(user_email, session)
+            book_uid = UUID(book_uid)
 
-            if not book:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="Book not found."
-                )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Book not found."
+            )
 
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
-                )
+        rating = review_data.rating
+        now = datetime.now()
 
-            review_data_dict = review_data.model_dump()
+        bumped_book = (
+            update(books_table)
+            .where(books_table.c.uid == book_uid)
+            .values(
+                {
+                    books_table.c.review_count: books_table.c.review_count + 1,
+                    books_table.c.rating_sum: books_table.c.rating_sum + rating,
+                    books_table.c.rating_histogram[rating]: (
+                        books_table.c.rating_histogram[rating] + 1
+                    ),
+                }
+            )
+            .returning(books_table.c.uid)
+            .cte("bumped_book")
+        )
 
-            new_review = Review(**review_data_dict)
+        new_review = select(
+            literal(uuid4(), reviews_table.c.uid.type),
+            literal(rating, reviews_table.c.rating.type),
+            literal(UUID(user_uid), reviews_table.c.user_uid.type),
+            bumped_book.c.uid,
+            literal(now, reviews_table.c.created_at.type),
+            literal(now, reviews_table.c.updated_at.type),
+        )
 
-            new_review.user = user
-            new_review.book = book
+        statement = (
+            insert(reviews_table)
+            .from_select(list(REVIEW_FIELDS), new_review)
+            .returning(*(reviews_table.c[field] for field in REVIEW_FIELDS))
+            .add_cte(bumped_book)
+        )
 
-            session.add(new_review)
+        try:
+            result = await session.exec(statement)
+            row = result.first()
             await session.commit()
 
-            return new_review
+        except IntegrityError as e:
+            await session.rollback()
 
-        except Exception as e:
+            if _violated_constraint(e) != REVIEWS_USER_FK:
+                raise
+
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
+            )
+
+        if row is None:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Something went wrong...",
+                status_code=status.HTTP_404_NOT_FOUND, detail="Book not found."
             )
+
+        await book_detail_cache.invalidate(book_uid)
+
+        return to_dict(row, REVIEW_FIELDS)
+
+    async def recompute_rating_aggregates(
+        self, book_uids: list, session: AsyncSession
+    ) -> None:
+        """Rebuild review_count, rating_sum and rating_histogram from reviews.
+
+        The book rows are locked by a first statement; the aggregate runs as a
+        second one, whose snapshot is taken after the lock was granted and so
+        includes every review committed by then. add_review calls that arrive
+        later wait on the lock and apply on top of the recomputed values.
+        """
+        params = {"book_uids": book_uids}
+        await session.exec(LOCK_BOOKS_SQL, params=params)
+        await session.exec(RECOMPUTE_AGGREGATES_SQL, params=params)
+        await session.commit()
@@ -0,0 +1,66 @@
+import orjson
+from fastapi.responses import Response
+
+BOOK_FIELDS = (
+    "uid",
+    "title",
+    "description",
+    "author",
+    "created_at",
+    "updated_at",
+    "review_count",
+    "rating_sum",
+    "rating_histogram",
+)
+REVIEW_FIELDS = ("uid", "rating", "user_uid", "book_uid", "created_at", "updated_at")
+USER_FIELDS = (
+    "uid",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_verified",
+    "created_at",
+    "updated_at",
+)
+
+
+def to_dict(obj, fields: tuple[str, ...]) -> dict:
+    return {field: getattr(obj, field) for field in fields}
+
+
+def rating_average(review_count: int, rating_sum: int) -> float | None:
+    return round(rating_sum / review_count, 2) if review_count else None
+
+
+def book_to_dict(book) -> dict:
+    data = to_dict(book, BOOK_FIELDS)
+    data["rating_average"] = rating_average(book.review_count, book.rating_sum)
+
+    return data
+
+
+def book_detail_to_dict(book, reviews) -> dict:
+    data = book_to_dict(book)
+    data["reviews"] = [to_dict(review, REVIEW_FIELDS) for review in reviews]
+
+    return data
+
+
+def user_books_to_dict(user) -> dict:
+    data = to_dict(user, USER_FIELDS)
+    data["books"] = [book_to_dict(book) for book in user.books]
+    data["reviews"] = [to_dict(review, REVIEW_FIELDS) for review in user.reviews]
+
+    return data
+
+
+def dump_json(data) -> bytes:
+    """Serialize plain rows straight to JSON; orjson handles UUID and datetime."""
+    return orjson.dumps(data)
+
+
+def json_response(data, status_code: int = 200) -> Response:
+    return Response(
+        content=dump_json(data), status_code=status_code, media_type="application/json"
+    )
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import threading
+from email.message import EmailMessage
+from email.utils import formataddr
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
+
+from src.config import Config
+from src.mail import mail_config
+
+logger = logging.getLogger(__name__)
+
+
+def build_email(recipients: list[str], subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((mail_config.MAIL_FROM_NAME, mail_config.MAIL_FROM))
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    message.set_content(body, subtype="html")
+    return message
+
+
+class SMTPPool:
+    """SMTP sessions kept open between tasks and reconnected when dropped.
+
+    Must only be used from the event loop of the owning `MailLoop`.
+    """
+
+    def __init__(self, config: ConnectionConfig, size: int, timeout: float) -> None:
+        self.config = config
+        self.timeout = timeout
+        # LIFO: a prefork child sends one batch at a time, so it keeps reusing
+        # the warm session and the spare ones only open under concurrency.
+        self._idle: asyncio.LifoQueue[aiosmtplib.SMTP] = asyncio.LifoQueue()
+
+        for _ in range(size):
+            self._idle.put_nowait(self._client())
+
+    def _client(self) -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            timeout=self.timeout,
+        )
+
+    async def _connect(self, client: aiosmtplib.SMTP) -> None:
+        if client.is_connected:
+            return
+
+        await client.connect()
+
+        if self.config.USE_CREDENTIALS:
+            await client.login(
+                self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD.get_secret_value()
+            )
+
+    async def _send_one(self, client: aiosmtplib.SMTP, message: EmailMessage) -> None:
+        try:
+            await self._connect(client)
+            await client.send_message(message)
+
+        except aiosmtplib.SMTPServerDisconnected:
+            # The server closed an idle session; reconnect once and retry.
+            client.close()
+            await self._connect(client)
+            await client.send_message(message)
+
+    async def send(self, messages: list[EmailMessage]) -> list[int]:
+        """Send `messages` over one session, return the indices that failed."""
+        client = await self._idle.get()
+        failed = []
+
+        try:
+            for index, message in enumerate(messages):
+                try:
+                    await self._send_one(client, message)
+
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    logger.warning("Could not send email to %s: %s", message["To"], e)
+                    failed.append(index)
+
+        finally:
+            self._idle.put_nowait(client)
+
+        return failed
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+
+            if not client.is_connected:
+                continue
+
+            try:
+                await client.quit()
+
+            except (aiosmtplib.SMTPException, OSError):
+                client.close()
+
+
+class MailLoop:
+    """Event loop thread owning the SMTP pool of one worker process.
+
+    Celery tasks are synchronous, so instead of spinning up a loop per task
+    they submit coroutines to this long-lived loop, where the SMTP sessions
+    live.
+    """
+
+    def __init__(self) -> None:
+        self.pool: SMTPPool | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="mail-loop", daemon=True
+            )
+            self._thread.start()
+            self.pool = SMTPPool(
+                mail_config, size=Config.MAIL_POOL_SIZE, timeout=Config.MAIL_TIMEOUT
+            )
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def send(self, messages: list[EmailMessage]) -> list[int]:
+        self.start()
+        return self.run(self.pool.send(messages))
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+
+            try:
+                self.run(self.pool.close())
+
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = self._thread = self.pool = None
+
+
+mail_loop = MailLoop()